@@ -0,0 +1,304 @@
+'''
+BAT Compressor Block Planner
+Author: Derek Bredbenner
+'''
+
+import struct
+
+
+class BlockPlanner(object):
+
+    #column encodings
+    RAW = 0
+    FOR = 1
+    DELTA = 2
+    DICT = 3
+    RLE = 4
+    VARDELTA = 5
+
+    def __init__(self, decodeCostWeight=0.1):
+        '''
+        Picks the cheapest encoding for each integer column of a block from raw,
+        frame of reference, delta, dictionary, run-length and variable length delta
+        encoding. Each candidate's
+        exact byte size is computed from the block's values and a decode cost per value
+        is added, the lowest scoring encoding is used and recorded before the column.
+
+        Parameters:
+            decodeCostWeight (float): bytes a unit of decode cost per value is worth
+
+        Attributes:
+            decodeCostWeight (float): bytes a unit of decode cost per value is worth
+            decodeCosts (Dict): relative decode cost per value of each encoding
+            repeatDecodeCost (float): relative decode cost per field of a changed record
+                                      in blocks with repeated fields flagged
+
+        Return:
+            None
+        '''
+        self.decodeCostWeight = decodeCostWeight
+        self.decodeCosts = {self.RAW:1.0, self.FOR:1.2, self.DELTA:1.6, self.DICT:1.4, self.RLE:0.6,
+                            self.VARDELTA:3.0}
+        self.repeatDecodeCost = 2.5
+
+    def decodeColumn(self, data, offset, count):
+        '''
+        Decode an integer column.
+
+        Parameters:
+            data (string): block's encoded data
+            offset (int): position of the column's encoding in data
+            count (int): number of values in the column
+
+        Attributes:
+            encoding (int): column's encoding
+            width (int): byte size of the column's encoded values
+
+        Return:
+            values (List:int): decoded values
+            offset (int): position after the column
+        '''
+        encoding, width = struct.unpack_from('<BB', data, offset)
+        offset += 2
+
+        if self.RAW == encoding:
+            values = list(struct.unpack_from('<{0}{1}'.format(count, self.signedFormat(width)), data, offset))
+            offset += count * width
+
+        elif self.FOR == encoding:
+            base = struct.unpack_from('<q', data, offset)[0]
+            offset += 8
+            values = [base + value for value in
+                      struct.unpack_from('<{0}{1}'.format(count, self.unsignedFormat(width)), data, offset)]
+            offset += count * width
+
+        elif self.DELTA == encoding:
+            value = struct.unpack_from('<q', data, offset)[0]
+            offset += 8
+            values = [value]
+            for delta in struct.unpack_from('<{0}{1}'.format(count - 1, self.unsignedFormat(width)), data, offset):
+                #undo zigzag encoding
+                if delta & 1:
+                    value -= (delta + 1) >> 1
+                else:
+                    value += delta >> 1
+                values.append(value)
+            offset += (count - 1) * width
+
+        elif self.DICT == encoding:
+            valueWidth, dictLength = struct.unpack_from('<BI', data, offset)
+            offset += 5
+            dictValues = struct.unpack_from('<{0}{1}'.format(dictLength, self.signedFormat(valueWidth)), data, offset)
+            offset += dictLength * valueWidth
+            values = [dictValues[code] for code in
+                      struct.unpack_from('<{0}{1}'.format(count, self.unsignedFormat(width)), data, offset)]
+            offset += count * width
+
+        elif self.RLE == encoding:
+            lengthWidth, runCount = struct.unpack_from('<BI', data, offset)
+            offset += 5
+            runValues = struct.unpack_from('<{0}{1}'.format(runCount, self.signedFormat(width)), data, offset)
+            offset += runCount * width
+            runLengths = struct.unpack_from('<{0}{1}'.format(runCount, self.unsignedFormat(lengthWidth)), data, offset)
+            offset += runCount * lengthWidth
+            values = []
+            for value, runLength in zip(runValues, runLengths):
+                values.extend([value] * runLength)
+
+        elif self.VARDELTA == encoding:
+            value, byteSize = struct.unpack_from('<qI', data, offset)
+            offset += 12
+            values = [value]
+            delta = shift = 0
+            for byte in bytearray(data[offset:offset + byteSize]):
+                #7 bits per byte, high bit set if more bytes follow
+                delta |= (byte & 127) << shift
+                if byte & 128:
+                    shift += 7
+                    continue
+                #undo zigzag encoding
+                if delta & 1:
+                    value -= (delta + 1) >> 1
+                else:
+                    value += delta >> 1
+                values.append(value)
+                delta = shift = 0
+            offset += byteSize
+
+        else:
+            raise ValueError('unknown column encoding {0}'.format(encoding))
+
+        return values, offset
+
+    def encodeColumn(self, values):
+        '''
+        Encode an integer column with its cheapest encoding.
+
+        Parameters:
+            values (List:int): column's values, at least one
+
+        Attributes:
+            candidates (List:Tuple(float,int,int)): score, byte size and encoding of each candidate
+
+        Return:
+            data (string): column's encoding followed by its encoded values
+        '''
+        count = len(values)
+        minValue = min(values)
+        maxValue = max(values)
+        valueWidth = self.signedWidth(minValue, maxValue)
+
+        #get run lengths, distinct values and zigzag encoded deltas
+        runValues = [values[0]]
+        runLengths = [1]
+        deltas = []
+        for x in range(1, count):
+            if values[x] == values[x - 1]:
+                runLengths[-1] += 1
+            else:
+                runValues.append(values[x])
+                runLengths.append(1)
+            delta = values[x] - values[x - 1]
+            deltas.append(delta * 2 if delta >= 0 else -delta * 2 - 1)
+        dictValues = sorted(set(values))
+        varintSize = sum([self.varintWidth(delta) for delta in deltas])
+
+        #exact byte size of each candidate encoding
+        sizes = {self.RAW: 2 + count * valueWidth,
+                 self.FOR: 10 + count * self.unsignedWidth(maxValue - minValue),
+                 self.DELTA: 10 + (count - 1) * self.unsignedWidth(max(deltas or [0])),
+                 self.DICT: 7 + len(dictValues) * valueWidth + count * self.unsignedWidth(len(dictValues) - 1),
+                 self.RLE: 7 + len(runValues) * valueWidth + len(runValues) * self.unsignedWidth(max(runLengths)),
+                 self.VARDELTA: 14 + varintSize}
+
+        #pick the lowest size plus weighted decode cost
+        candidates = sorted([(sizes[encoding] + self.decodeCostWeight * count * self.decodeCosts[encoding],
+                              sizes[encoding], encoding) for encoding in sizes])
+        encoding = candidates[0][2]
+
+        if self.RAW == encoding:
+            return struct.pack('<BB{0}{1}'.format(count, self.signedFormat(valueWidth)),
+                               encoding, valueWidth, *values)
+
+        elif self.FOR == encoding:
+            width = self.unsignedWidth(maxValue - minValue)
+            return struct.pack('<BBq{0}{1}'.format(count, self.unsignedFormat(width)),
+                               encoding, width, minValue, *[value - minValue for value in values])
+
+        elif self.DELTA == encoding:
+            width = self.unsignedWidth(max(deltas or [0]))
+            return struct.pack('<BBq{0}{1}'.format(count - 1, self.unsignedFormat(width)),
+                               encoding, width, values[0], *deltas)
+
+        elif self.DICT == encoding:
+            width = self.unsignedWidth(len(dictValues) - 1)
+            codes = dict([(value, code) for code, value in enumerate(dictValues)])
+            return struct.pack('<BBBI{0}{1}{2}{3}'.format(len(dictValues), self.signedFormat(valueWidth),
+                                                        count, self.unsignedFormat(width)),
+                               encoding, width, valueWidth, len(dictValues),
+                               *(dictValues + [codes[value] for value in values]))
+
+        elif self.VARDELTA == encoding:
+            varints = bytearray()
+            for delta in deltas:
+                #7 bits per byte, high bit set if more bytes follow
+                while delta >= 128:
+                    varints.append(delta & 127 | 128)
+                    delta >>= 7
+                varints.append(delta)
+            return struct.pack('<BBqI', encoding, 0, values[0], len(varints)) + str(varints)
+
+        else:
+            lengthWidth = self.unsignedWidth(max(runLengths))
+            return struct.pack('<BBBI{0}{1}{2}{3}'.format(len(runValues), self.signedFormat(valueWidth),
+                                                        len(runValues), self.unsignedFormat(lengthWidth)),
+                               encoding, valueWidth, lengthWidth, len(runValues),
+                               *(runValues + runLengths))
+
+    def getColumnDecodeCost(self, recordCount):
+        '''
+        Get the weighted decode cost of a column encoded block's records.
+        '''
+        return self.decodeCostWeight * recordCount * 9 * self.decodeCosts[self.RAW]
+
+    def getRepeatDecodeCost(self, changedRecords):
+        '''
+        Get the weighted decode cost of a block's changed records with repeated fields flagged.
+        '''
+        return self.decodeCostWeight * changedRecords * 9 * self.repeatDecodeCost
+
+    def signedFormat(self, width):
+        '''
+        Get the struct format of a signed integer byte size.
+        '''
+        return {1:'b', 2:'h', 4:'i', 8:'q'}[width]
+
+    def signedWidth(self, minValue, maxValue):
+        '''
+        Get the byte size needed for signed integers in [minValue, maxValue].
+        '''
+        for width in (1, 2, 4):
+            limit = 1 << (8 * width - 1)
+            if minValue >= -limit and maxValue < limit:
+                return width
+        return 8
+
+    def skipColumn(self, data, offset, count):
+        '''
+        Get the position after an integer column without decoding its values.
+
+        Parameters:
+            data (string): block's encoded data
+            offset (int): position of the column's encoding in data
+            count (int): number of values in the column
+
+        Attributes:
+            encoding (int): column's encoding
+            width (int): byte size of the column's encoded values
+
+        Return:
+            offset (int): position after the column
+        '''
+        encoding, width = struct.unpack_from('<BB', data, offset)
+
+        if self.RAW == encoding:
+            return offset + 2 + count * width
+        elif self.FOR == encoding:
+            return offset + 10 + count * width
+        elif self.DELTA == encoding:
+            return offset + 10 + (count - 1) * width
+        elif self.DICT == encoding:
+            valueWidth, dictLength = struct.unpack_from('<BI', data, offset + 2)
+            return offset + 7 + dictLength * valueWidth + count * width
+        elif self.RLE == encoding:
+            lengthWidth, runCount = struct.unpack_from('<BI', data, offset + 2)
+            return offset + 7 + runCount * (width + lengthWidth)
+        elif self.VARDELTA == encoding:
+            return offset + 14 + struct.unpack_from('<I', data, offset + 10)[0]
+
+        raise ValueError('unknown column encoding {0}'.format(encoding))
+
+    def unsignedFormat(self, width):
+        '''
+        Get the struct format of an unsigned integer byte size.
+        '''
+        return {1:'B', 2:'H', 4:'I', 8:'Q'}[width]
+
+    def varintWidth(self, value):
+        '''
+        Get the byte size of an unsigned integer encoded with 7 bits per byte.
+        '''
+        width = 1
+        while value >= 128:
+            value >>= 7
+            width += 1
+        return width
+
+    def unsignedWidth(self, maxValue):
+        '''
+        Get the byte size needed for unsigned integers up to maxValue.
+        '''
+        for width in (1, 2, 4):
+            if maxValue < 1 << (8 * width):
+                return width
+        return 8
@@ -0,0 +1,233 @@
+'''
+BAT Compressor Jobs
+Author: Derek Bredbenner
+'''
+
+import io
+import sys
+import threading
+
+import compressor
+
+
+class CompressJob(object):
+
+    def __init__(self, mode, iFileName, oFileName, progress=None, done=None, executor=None, pipelineDepth=4):
+        '''
+        Runs a compression or decompression without blocking the caller. Errors are
+        raised from wait() instead of exiting the process, so one service can run
+        many jobs concurrently. Each job writes its messages to its own stream instead
+        of the shared standard output, and reads and writes its files on pipelined
+        reader and writer threads overlapping the encoding, see pipeline.py.
+        NOTE: for an event loop, pass a done callback handing the job back to the
+        loop's thread (ie - loop.call_soon_threadsafe).
+
+        Parameters:
+            mode (string): 'compress' or 'decompress'
+            iFileName (string): input file
+            oFileName (string): output file
+            progress (function): called with (rows done, row count) after every block,
+                                 from the job's thread
+            done (function): called with the job when it finishes, from the job's thread
+            executor (Executor): runs the job through executor.submit(), a new thread if None.
+                                 Progress and cancellation need a thread based executor
+            pipelineDepth (int): number of chunks queued between the pipelined reader, encoder
+                                 and writer stages, 0 disables pipelining
+
+        Attributes:
+            mode (string): 'compress' or 'decompress'
+            iFileName (string): input file
+            oFileName (string): output file
+            progress (function): called with (rows done, row count) after every block
+            done (function): called with the job when it finishes
+            executor (Executor): runs the job, a new thread if None
+            pipelineDepth (int): number of chunks queued between the pipelined stages
+            output (BytesIO): the job's messages
+            cancelEvent (Event): stops the job when set
+            finishedEvent (Event): set when the job finishes
+            error (Exception): raised by the job, None if successful
+            errorInfo (Tuple): exception info used to re-raise the job's error
+
+        Return:
+            None
+        '''
+        if mode not in ('compress', 'decompress'):
+            raise compressor.CompressorError('Job mode should be compress or decompress')
+
+        self.mode = mode
+        self.iFileName = iFileName
+        self.oFileName = oFileName
+        self.progress = progress
+        self.done = done
+        self.executor = executor
+        self.pipelineDepth = pipelineDepth
+        self.output = io.BytesIO()
+        self.cancelEvent = threading.Event()
+        self.finishedEvent = threading.Event()
+        self.error = None
+        self.errorInfo = None
+
+    def cancel(self):
+        '''
+        Cancel the job, it stops at the next block with CompressorCancelled.
+
+        Parameters:
+            None
+
+        Attributes:
+            None
+
+        Return:
+            None
+        '''
+        self.cancelEvent.set()
+
+    def cancelled(self):
+        '''
+        Check whether the job stopped because it was cancelled.
+
+        Parameters:
+            None
+
+        Attributes:
+            None
+
+        Return:
+            cancelled (Bool): True if the job was cancelled
+        '''
+        return isinstance(self.error, compressor.CompressorCancelled)
+
+    def execute(self):
+        '''
+        Run the compression or decompression, recording its error.
+
+        Parameters:
+            None
+
+        Attributes:
+            job (Compressor): runs the compression or decompression
+
+        Return:
+            None
+        '''
+        try:
+            job = compressor.Compressor()
+            job.progress = self.progress
+            job.cancelEvent = self.cancelEvent
+            job.pipelineDepth = self.pipelineDepth
+            job.output = self.output
+            getattr(job, self.mode)(self.iFileName, self.oFileName)
+        except Exception as error:
+            self.error = error
+            self.errorInfo = sys.exc_info()
+        finally:
+            self.finishedEvent.set()
+            if self.done is not None:
+                self.done(self)
+
+    def finished(self):
+        '''
+        Check whether the job finished.
+
+        Parameters:
+            None
+
+        Attributes:
+            None
+
+        Return:
+            finished (Bool): True if the job finished, successfully or not
+        '''
+        return self.finishedEvent.is_set()
+
+    def messages(self):
+        '''
+        Get the messages the job has written so far.
+
+        Parameters:
+            None
+
+        Attributes:
+            None
+
+        Return:
+            messages (string): the job's messages, one per line
+        '''
+        return self.output.getvalue()
+
+    def start(self):
+        '''
+        Start the job on the executor or a new thread.
+
+        Parameters:
+            None
+
+        Attributes:
+            thread (Thread): runs the job when no executor is given
+
+        Return:
+            job (CompressJob): this job
+        '''
+        if self.executor is not None:
+            self.executor.submit(self.execute)
+        else:
+            thread = threading.Thread(target=self.execute)
+            thread.daemon = True
+            thread.start()
+
+        return self
+
+    def wait(self, timeout=None):
+        '''
+        Wait for the job to finish and raise its error.
+
+        Parameters:
+            timeout (float): seconds to wait, wait until finished if None
+
+        Attributes:
+            None
+
+        Return:
+            finished (Bool): True if the job finished, False on timeout
+        '''
+        if not self.finishedEvent.wait(timeout):
+            return False
+
+        if self.errorInfo is not None:
+            raise self.errorInfo[0], self.errorInfo[1], self.errorInfo[2]
+
+        return True
+
+
+def compressAsync(iFileName, bFileName, progress=None, done=None, executor=None):
+    '''
+    Start compressing a BAT file without blocking the caller.
+
+    Parameters:
+        iFileName (string): BAT file to be compressed
+        bFileName (string): compressed file
+        progress (function): called with (rows done, row count) after every block
+        done (function): called with the job when it finishes
+        executor (Executor): runs the job, a new thread if None
+
+    Return:
+        job (CompressJob): started job
+    '''
+    return CompressJob('compress', iFileName, bFileName, progress, done, executor).start()
+
+
+def decompressAsync(bFileName, oFileName, progress=None, done=None, executor=None):
+    '''
+    Start decompressing a compressed file without blocking the caller.
+
+    Parameters:
+        bFileName (string): compressed file
+        oFileName (string): BAT file to be decompressed
+        progress (function): called with (rows done, row count) after every block
+        done (function): called with the job when it finishes
+        executor (Executor): runs the job, a new thread if None
+
+    Return:
+        job (CompressJob): started job
+    '''
+    return CompressJob('decompress', bFileName, oFileName, progress, done, executor).start()
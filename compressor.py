@@ -6,12 +6,43 @@ Author: Derek Bredbenner
 '''
 
 import sys
+import bisect
+import glob
+import heapq
+import io
+import itertools
+import multiprocessing
 import os.path
+import shutil
 import struct
+import tempfile
+import zipfile
+import zlib
+
+#peak memory is reported where available
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import blockPlanner
+import pipeline
 
 from TickerStruct import tickerStruct_Factory as tsF
 
 
+class CompressorError(Exception):
+    '''
+    Raised when a file cannot be compressed, decompressed or the arguments are invalid.
+    '''
+
+
+class CompressorCancelled(CompressorError):
+    '''
+    Raised when a running compression or decompression is cancelled.
+    '''
+
+
 class Compressor(object):
 
     def __init__(self):
@@ -25,16 +56,51 @@ class Compressor(object):
             tickerList (TickerList): used for collecting tickers, building 
                                      ticker dictionary and encoding tickers
             tickerDict (List:string): used for decoding tickers
-            idNumber (int): file identifier
+            idNumber (int): file identifier (19: records only, 20: records in blocks
+                            followed by the block index, 22: column encoded blocks
+                            followed by the block index)
             rowCount (int): count total number of lines in BAT files and compressed files
+            blockSize (int): number of records encoded per block
+            progress (function): called with (rows done, row count) after every block, None to disable
+            cancelEvent (Event): stops compression or decompression when set, None to disable
+            pipelineDepth (int): number of chunks queued between the pipelined reader, encoder
+                                 and writer stages, 0 disables pipelining
+            chunkSize (int): byte size of the input chunks read by the pipelined reader
+            blockPlanner (BlockPlanner): picks each column's encoding in column encoded blocks
+            repeatFields (Bool): column encoded blocks flag the fields repeating the previous
+                                 record's values and only store the changed values,
+                                 in blocks where it is cheaper
+            groupTickers (Bool): column encoded blocks store columns grouped by ticker when
+                                 smaller, the original tickers restore the original order
+            groupedOutput (Bool): decoded blocks keep their records grouped by ticker
+                                  instead of restoring the original order
+            memoryBudget (int): estimated byte size of the records buffered by single pass
+                                compression and split by ticker
+            output (file): stream the messages are written to
+            messages (Bool): print the header decoding messages
+            skipDamaged (Bool): skip damaged blocks with a warning instead of raising
+                                CompressorError, see readBlock()
 
         Return:
             None
         '''
         self.tickerStruct = tsF.TickerStruct_Factory().getTickerStruct()
         self.tickerDict = []
-        self.idNumber = 19
+        self.idNumber = 22
         self.rowCount = 0
+        self.blockSize = 4096
+        self.progress = None
+        self.cancelEvent = None
+        self.pipelineDepth = 0
+        self.chunkSize = 1 << 20
+        self.blockPlanner = blockPlanner.BlockPlanner()
+        self.repeatFields = False
+        self.groupTickers = False
+        self.groupedOutput = False
+        self.memoryBudget = 64 << 20
+        self.output = sys.stdout
+        self.messages = True
+        self.skipDamaged = False
 
    
 
@@ -51,9 +117,241 @@ class Compressor(object):
         Return:
             None
         '''
-        if idNumber != self.idNumber:
-            sys.stdout.write('Cannot decompress Input file, not generated by this program\n')
-            sys.exit()    
+        if idNumber not in (19, 20, 22):
+            raise CompressorError('Cannot decompress Input file, not generated by this program')
+
+    def decodeManifest(self,  aFile):
+        '''
+        Decode an archive's manifest.
+
+        Parameters:
+            aFile (file): file object for archive
+
+        Attributes:
+            idNumber (int): archive identifier
+            manifestOffset (int): file position of the manifest
+            memberCount (int): number of members in the archive
+
+        Return:
+            manifest (List:Tuple(string,int,int,int,int,int)): member's name, file position,
+                                                               byte size, row count, minimum
+                                                               and maximum sendtime
+        '''
+        #decode archive identifier (2 bytes, unsigned short)
+        aFile.seek(0)
+        idNumber = struct.unpack('H',aFile.read(2))[0]
+        if 21 != idNumber:
+            raise CompressorError('Cannot extract Input file, not an archive generated by this program')
+
+        #decode manifest position and member count (8 bytes, unsigned long long and 4 bytes, unsigned int)
+        aFile.seek(-struct.calcsize('QI'), 2)
+        manifestOffset, memberCount = struct.unpack('QI',aFile.read(struct.calcsize('QI')))
+
+        #decode manifest entries
+        aFile.seek(manifestOffset)
+        manifest = []
+        for x in range(memberCount):
+            nameSize = struct.unpack('H',aFile.read(2))[0]
+            memberName = aFile.read(nameSize)
+            manifest.append((memberName,) + struct.unpack('QQQii',aFile.read(struct.calcsize('QQQii'))))
+
+        return manifest
+
+    def decodeBlockIndex(self,  bFile):
+        '''
+        Decode the block index at the end of the compressed file.
+        NOTE: leaves the file positioned at the first block.
+
+        Parameters:
+            bFile (file): file object for compressed file, header already decoded
+
+        Attributes:
+            blockStart (int): file position of the first block
+            footerOffset (int): file position of the block index
+            blockCount (int): number of blocks in the compressed file
+
+        Return:
+            blockIndex (List:Tuple(int,int,int,int)): block's file position, row count,
+                                                      minimum and maximum sendtime
+        '''
+        blockStart = bFile.tell()
+
+        #decode block index position and block count (8 bytes, unsigned long long and 4 bytes, unsigned int)
+        bFile.seek(-struct.calcsize('QI'), 2)
+        footerOffset, blockCount = struct.unpack('QI',bFile.read(struct.calcsize('QI')))
+
+        #decode block index entries
+        bFile.seek(footerOffset)
+        entrySize = struct.calcsize('QIii')
+        blockIndex = [struct.unpack('QIii',bFile.read(entrySize)) for x in range(blockCount)]
+
+        bFile.seek(blockStart)
+
+        return blockIndex
+
+    def decodeBlockSpans(self,  bFile):
+        '''
+        Decode each block's span from the block index, blocks are stored back to back
+        up to the block index.
+        NOTE: leaves the file positioned where it was.
+
+        Parameters:
+            bFile (file): file object for compressed file, header already decoded
+
+        Attributes:
+            blockIndex (List:Tuple(int,int,int,int)): see decodeBlockIndex()
+            blockOffsets (List:int): file position of each block followed by the block index's
+
+        Return:
+            blockSpans (List:Tuple(int,int,int)): block's file position, row count and
+                                                  byte size of its encoded records
+        '''
+        blockStart = bFile.tell()
+        blockIndex = self.decodeBlockIndex(bFile)
+        blockOffsets = [entry[0] for entry in blockIndex] + [self.decodeTrailer(bFile)[0]]
+        bFile.seek(blockStart)
+
+        return [(blockIndex[x][0], blockIndex[x][1], blockOffsets[x + 1] - blockOffsets[x] - 8)
+                for x in range(len(blockIndex))]
+
+    def decodeBlock(self,  blockData,  blockRows,  tickerDecode_MemSize):
+        '''
+        Decode a block's records.
+
+        Parameters:
+            blockData (string): block's encoded records
+            blockRows (int): number of records in the block
+            tickerDecode_MemSize (int): encoded ticker's byte memory size to be decoded
+
+        Attributes:
+            blockFlags (int): bit 1 set if float prices are float bits instead of scaled by
+                              their precision, bit 2 set if repeated fields are flagged,
+                              bit 3 set if records are grouped by ticker
+
+        Return:
+            records (List:Tuple): see decodeRecord()
+        '''
+        #records not column encoded
+        if 22 != self.idNumber:
+            blockFile = io.BytesIO(blockData)
+            return [self.decodeRecord(blockFile,  tickerDecode_MemSize) for x in range(blockRows)]
+
+        #column encoded blocks
+        blockFlags = struct.unpack_from('<B', blockData)[0]
+        priceMode = blockFlags & 1
+        offset = 1
+
+        #repeated fields flagged
+        if blockFlags & 2:
+            return self.decodeRepeatBlock(blockData,  offset,  blockRows,  priceMode)
+
+        return self.decodeColumnBlock(blockData,  offset,  blockRows,  priceMode,  blockFlags & 4)
+
+    def decodeChecksums(self,  bFile):
+        '''
+        Decode the block checksums following the file statistics.
+
+        Parameters:
+            bFile (file): file object for compressed file, header already decoded
+
+        Attributes:
+            trailerData (string): file statistics followed by the block checksums
+            statsEnd (int): position after the file statistics in trailerData
+
+        Return:
+            checksums (List:int): CRC32 of each block's records, None if the file has no checksums
+        '''
+        footerOffset, blockCount, trailerData = self.decodeTrailer(bFile)
+        if not trailerData:
+            return None
+
+        #skip the sendtime range, byte size per field and row count per ticker
+        statsEnd = struct.calcsize('<ii10Q')
+        if self.tickerDict:
+            statsEnd = self.blockPlanner.skipColumn(trailerData,  statsEnd,  len(self.tickerDict))
+
+        #files written with statistics but without checksums
+        if len(trailerData) - statsEnd != 4 * blockCount:
+            return None
+
+        return list(struct.unpack_from('<{0}I'.format(blockCount), trailerData, statsEnd))
+
+    def decodeColumnBlock(self,  blockData,  offset,  blockRows,  priceMode,  grouped=False):
+        '''
+        Decode a column encoded block's columns into records. In blocks grouped by ticker
+        the ticker column keeps the original record order, a stable sort of it gives the
+        permutation grouping the records. The other columns are stored in either order.
+
+        Parameters:
+            blockData (string): block's encoded records
+            offset (int): position of the first column in blockData
+            blockRows (int): number of records in the block
+            priceMode (int): 0 if float prices are scaled by their precision, 1 if float bits
+            grouped (Bool): True if the block's records are grouped by ticker
+
+        Attributes:
+            columns (List:List:int): decoded ticker, exchange, side, condition, sendtime,
+                                     time difference, price, size and price precision columns
+            groupedColumns (int): bit set per column stored in grouped order
+            permutation (List:int): original position of each grouped record
+
+        Return:
+            records (List:Tuple): see decodeRecord(), grouped by ticker if groupedOutput
+        '''
+        groupedColumns = 0
+        if grouped:
+            groupedColumns = struct.unpack_from('<H', blockData, offset)[0]
+            offset += 2
+
+        columns = []
+        for x in range(9):
+            values, offset = self.blockPlanner.decodeColumn(blockData,  offset,  blockRows)
+            columns.append(values)
+
+        #put every column in the output order
+        if grouped:
+            permutation = sorted(range(blockRows), key=columns[0].__getitem__)
+            for x in range(9):
+                if self.groupedOutput and not groupedColumns & (1 << x):
+                    columns[x] = [columns[x][y] for y in permutation]
+                elif not self.groupedOutput and groupedColumns & (1 << x):
+                    values = [0] * blockRows
+                    for y, value in zip(permutation, columns[x]):
+                        values[y] = value
+                    columns[x] = values
+        tickers, exchanges, sides, conditions, sendTimes, timeDiffs, prices, sizes, precisions = columns
+
+        #restore float prices to their 4 byte float values
+        floatRows = [x for x in range(blockRows) if precisions[x]]
+        if floatRows:
+            if 0 == priceMode:
+                floatPrices = [prices[x] / float(10 ** precisions[x]) for x in floatRows]
+                floatPrices = struct.unpack('<{0}f'.format(len(floatRows)),
+                                            struct.pack('<{0}f'.format(len(floatRows)), *floatPrices))
+            else:
+                floatPrices = struct.unpack('<{0}f'.format(len(floatRows)),
+                                            struct.pack('<{0}i'.format(len(floatRows)), *[prices[x] for x in floatRows]))
+            for x, price in zip(floatRows, floatPrices):
+                prices[x] = price
+
+        #rebuild condition flags from the byte memory sizes and price precision
+        records = []
+        for x in range(blockRows):
+            timeDiff = timeDiffs[x]
+            size = sizes[x]
+            condFlags = precisions[x]
+            if timeDiff >= 65536:
+                condFlags += 64
+            elif timeDiff >= 256:
+                condFlags += 32
+            if size >= 65536:
+                condFlags += 16
+            elif size >= 256:
+                condFlags += 8
+            records.append((condFlags, tickers[x], chr(exchanges[x]), chr(sides[x]), chr(conditions[x]),
+                            sendTimes[x], timeDiff, prices[x], size))
+
+        return records
 
     def decodeHeader(self,  bFile):
         '''
@@ -75,12 +373,14 @@ class Compressor(object):
             tickerDecode_MemSize (int): encoded ticker's byte memory size to be decoded
         '''
         #message
-        sys.stdout.write('decoding header...\n')
+        if self.messages:
+            self.output.write('decoding header...\n')
         #decode file identifier
         idNumber = struct.unpack('H',bFile.read(2))[0]
 
         #check file identifier
         self.checkID(idNumber)
+        self.idNumber = idNumber
 
         #read number of lines from compressed file
         self.rowCount = struct.unpack('L',bFile.read(8))[0]
@@ -90,7 +390,8 @@ class Compressor(object):
         tickerDict_Length = struct.unpack('H',bFile.read(2))[0]
 
         #message
-        sys.stdout.write('decoding ticker dictionary...\n')
+        if self.messages:
+            self.output.write('decoding ticker dictionary...\n')
         #decode ticker array
         for x in range(tickerDict_Length):
             #set ticker variable
@@ -102,67 +403,174 @@ class Compressor(object):
                 tickerValue = tickerValue + struct.unpack('c',bFile.read(1))[0]
             #append ticker to ticker dictionary
             self.tickerDict.append(tickerValue)
+
+        #decode block size (4 bytes, unsigned int)
+        if 19 != self.idNumber:
+            self.blockSize = struct.unpack('I',bFile.read(4))[0]
             
         return tickerDecode_MemSize
 
-    def decodePrice(self,  bFile,  oFile,  condFlags):
+    def decodeRecord(self,  bFile,  tickerDecode_MemSize):
         '''
-        Deocde price.
-        
+        Decode a single record into its field values without rendering any text.
+
         Parameters:
             bFile (file): file object for compressed file
-            oFile (file): file object for BAT file to be decompressed
-            condFlags (int): condition flags for line byte memory size, combination 
-                             of timDiff_Flags, size_Flags and price precision
-        
+            tickerDecode_MemSize (int): encoded ticker's byte memory size to be decoded
+
         Attributes:
-            pricePrecision (int): condition flags for the number of digits right of line 
-                                  price's decimal point
-        
+            condFlags (int): condition flags for line byte memory size, combination
+                             of timDiff_Flags, size_Flags and price precision
+            decodeIndex (int): encoded ticker value to be decoded by ticker dictionary
+
         Return:
-            None
+            record (Tuple): (condFlags, decodeIndex, exchange, side, condition,
+                             sendTime, timeDiff, price, size)
         '''
-        #get price precision from condition flags
-        pricePrecision = condFlags & 7
-        
-        #check price precision
-        if 0 == pricePrecision:
-            #must decode price precision in int format if price precision is zero
-            oFile.write(str(struct.unpack('i',bFile.read(4))[0])+',')
+        #decode condition flags (1 byte, char)
+        condFlags = ord(struct.unpack('c',bFile.read(1))[0])
+
+        #decode ticker using its byte memory size
+        if 1 == tickerDecode_MemSize:
+            #(1 byte, unsigned char)
+            decodeIndex = struct.unpack('B',bFile.read(1))[0]
+        elif 2 == tickerDecode_MemSize:
+            #(2 bytes, unsigned short)
+            decodeIndex = struct.unpack('H',bFile.read(2))[0]
+        elif 4 == tickerDecode_MemSize:
+            #(4 bytes, unsigned int)
+            decodeIndex = struct.unpack('I',bFile.read(4))[0]
+
+        #decode exchange, side and condition (1 byte each, char)
+        exchange, side, condition = struct.unpack('ccc',bFile.read(3))
+
+        #read sendtime (4 bytes, int)
+        sendTime = struct.unpack('i',bFile.read(4))[0]
+
+        #read time difference
+        timeDiff = self.decodeTimeDiff(bFile,  condFlags)
+
+        #decode price as int or float based on price precision
+        if 0 == condFlags & 7:
+            price = struct.unpack('i',bFile.read(4))[0]
         else:
-            #must decode price precision in float format with change precision if nonzero 
-            precisionFormat = '{0:.' + str(pricePrecision) + 'f}'
-            oFile.write(precisionFormat.format(struct.unpack('f',bFile.read(4))[0])+',')
+            price = struct.unpack('f',bFile.read(4))[0]
+
+        #decode size based on condition flags
+        if condFlags & 16:
+            size = struct.unpack('I',bFile.read(4))[0]
+        elif condFlags & 8:
+            size = struct.unpack('H',bFile.read(2))[0]
+        else:
+            size = struct.unpack('B',bFile.read(1))[0]
+
+        return (condFlags, decodeIndex, exchange, side, condition, sendTime, timeDiff, price, size)
 
-    def decodeSize(self,  bFile,  oFile,  condFlags):
+    def decodeRepeatBlock(self,  blockData,  offset,  blockRows,  priceMode):
         '''
-        Decode size.
-        
+        Decode a column encoded block with repeated fields flagged. Each record's repeat
+        mask has a bit set per field equal to the previous record's, only the changed
+        values are stored in the columns. Records repeating every field reuse the
+        previous record.
+
         Parameters:
-            bFile (file): file object for compressed file
-            oFile (file): file object for BAT file to be decompressed
-            condFlags (int): condition flags for line byte memory size, combination 
-                             of timDiff_Flags, size_Flags and price precision
-               
+            blockData (string): block's encoded records
+            offset (int): position of the repeat masks in blockData
+            blockRows (int): number of records in the block
+            priceMode (int): 0 if float prices are scaled by their precision, 1 if float bits
+
         Attributes:
-            None
-               
+            repeatMasks (List:int): repeated fields of each record
+            columns (List:iterator): changed values of each field
+            changedFields (Dict): changed field positions of each repeat mask
+            values (List:int): current values of each field
+
         Return:
-            None
+            records (List:Tuple): see decodeRecord()
         '''
-        #decode size based on condition flags
-        #check bit #5
-        if condFlags & 16:
-            #decode size (4 bytes, unsigend int)
-            oFile.write(str(struct.unpack('I',bFile.read(4))[0]))
-        #check bit #4
-        elif condFlags & 8:
-            #decode size (2 bytes, unsigned short)
-            oFile.write(str(struct.unpack('H',bFile.read(2))[0]))
-        #bit #5 and bit #4 not on
-        else:
-            #decode size (1 byte, unsigned char)
-            oFile.write(str(struct.unpack('B',bFile.read(1))[0]))
+        repeatMasks, offset = self.blockPlanner.decodeColumn(blockData,  offset,  blockRows)
+
+        #decode each field's changed values, fields always repeated have no column
+        columns = []
+        for x in range(9):
+            changedRows = blockRows - len([mask for mask in repeatMasks if mask & (1 << x)])
+            values = []
+            if changedRows:
+                values, offset = self.blockPlanner.decodeColumn(blockData,  offset,  changedRows)
+            #exchange, side and condition characters
+            if x in (1, 2, 3):
+                values = map(chr, values)
+            columns.append(iter(values))
+
+        #changed fields of each repeat mask
+        changedFields = dict([(mask, [x for x in range(9) if not mask & (1 << x)]) for mask in set(repeatMasks)])
+        nextValues = [column.next for column in columns]
+
+        records = []
+        values = [0] * 9
+        price = condFlags = 0
+        for repeatMask in repeatMasks:
+            #fast path, every field repeated
+            if 511 == repeatMask:
+                records.append(records[-1])
+                continue
+
+            for x in changedFields[repeatMask]:
+                values[x] = nextValues[x]()
+
+            #restore float price to its 4 byte float value when price or precision changed
+            if 320 != repeatMask & 320:
+                price = values[6]
+                if values[8]:
+                    if 0 == priceMode:
+                        price = struct.unpack('<f', struct.pack('<f', price / float(10 ** values[8])))[0]
+                    else:
+                        price = struct.unpack('<f', struct.pack('<i', price))[0]
+
+            #rebuild condition flags when time difference, size or precision changed
+            if 416 != repeatMask & 416:
+                condFlags = values[8]
+                if values[5] >= 65536:
+                    condFlags += 64
+                elif values[5] >= 256:
+                    condFlags += 32
+                if values[7] >= 65536:
+                    condFlags += 16
+                elif values[7] >= 256:
+                    condFlags += 8
+
+            records.append((condFlags, values[0], values[1], values[2], values[3],
+                            values[4], values[5], price, values[7]))
+
+        return records
+
+    def decodeStats(self,  bFile):
+        '''
+        Decode the file statistics between the block index and the footer, reading
+        only the footer and the statistics.
+
+        Parameters:
+            bFile (file): file object for compressed file, header already decoded
+
+        Attributes:
+            statsData (string): file statistics followed by the block checksums
+
+        Return:
+            blockCount (int): number of blocks in the compressed file
+            stats (Tuple): see encodeStats(), None if the file has no statistics
+        '''
+        footerOffset, blockCount, statsData = self.decodeTrailer(bFile)
+
+        #files written without statistics end with the block index
+        if not statsData:
+            return blockCount, None
+
+        statsValues = struct.unpack_from('<ii10Q', statsData)
+        tickerCounts = []
+        if self.tickerDict:
+            tickerCounts = self.blockPlanner.decodeColumn(statsData,  struct.calcsize('<ii10Q'),  len(self.tickerDict))[0]
+
+        return blockCount, (statsValues[0], statsValues[1], list(statsValues[2:]), tickerCounts)
 
     def decodeTimeDiff(self,  bFile,  condFlags):
         '''
@@ -195,6 +603,274 @@ class Compressor(object):
             
         return timeDiff
 
+    def decodeTrailer(self,  bFile):
+        '''
+        Decode the footer and read the data between the block index and the footer.
+
+        Parameters:
+            bFile (file): file object for compressed file, header already decoded
+
+        Attributes:
+            footerEnd (int): file position of the footer
+            trailerOffset (int): file position after the block index
+
+        Return:
+            footerOffset (int): file position of the block index
+            blockCount (int): number of blocks in the compressed file
+            trailerData (string): file statistics and block checksums, empty if the file has none
+        '''
+        #decode block index position and block count
+        bFile.seek(-struct.calcsize('QI'), 2)
+        footerEnd = bFile.tell()
+        footerOffset, blockCount = struct.unpack('QI',bFile.read(struct.calcsize('QI')))
+
+        trailerOffset = footerOffset + struct.calcsize('QIii') * blockCount
+        if trailerOffset > footerEnd:
+            raise CompressorError('Block index extends past the footer')
+        bFile.seek(trailerOffset)
+
+        return footerOffset, blockCount, bFile.read(footerEnd - trailerOffset)
+
+    def decompressBlocks(self,  bFile,  oFile,  tickerDecode_MemSize):
+        '''
+        Decompress the records in blocks with pipelined stages. A reader thread reads
+        the blocks ahead, the blocks are decoded and a writer thread writes their lines.
+
+        Parameters:
+            bFile (file): file object for compressed file, positioned at the first block
+            oFile (file): file object for BAT file to be decompressed
+            tickerDecode_MemSize (int): encoded ticker's byte memory size to be decoded
+
+        Attributes:
+            blockReader (ChunkReader): reads (block rows, block data) ahead
+            output (QueuedWriter): writes each block's lines
+
+        Return:
+            None
+        '''
+        blockReader = pipeline.ChunkReader(self.iterBlocks(bFile),  self.pipelineDepth)
+        output = pipeline.QueuedWriter(oFile,  self.pipelineDepth)
+        try:
+            rowsDone = 0
+            for blockRows, blockData in blockReader:
+                output.write(''.join([self.formatRecord(record) for record in
+                                      self.decodeBlock(blockData,  blockRows,  tickerDecode_MemSize)]))
+
+                #report progress after every block
+                rowsDone += blockRows
+                self.reportProgress(rowsDone)
+        finally:
+            blockReader.close()
+            output.close()
+
+    def decompressFile(self,  bFile,  oFileName):
+        '''
+        Decompress an open compressed file into file with BAT data.
+
+        Parameters:
+            bFile (file): file object for compressed file, positioned at the header
+            oFileName (string): BAT file to be decompressed
+
+        Attributes:
+            tickerDecode_MemSize (int): encoded ticker's byte memory size to be decoded
+            record (Tuple): decoded field values of a line, see decodeRecord()
+
+        Return:
+            None
+        '''
+        with open(oFileName, 'wb') as oFile:
+
+            ###beginning of header decoding###
+            
+            #decode header
+            tickerDecode_MemSize = self.decodeHeader(bFile)
+
+            ###beginning of record decoding###
+
+            #message
+            self.output.write('decoding records...\n')
+
+            #pipelined mode reads blocks and writes lines on their own threads
+            if self.pipelineDepth and 19 != self.idNumber:
+                self.decompressBlocks(bFile,  oFile,  tickerDecode_MemSize)
+                return
+
+            #iterate through compressed file
+            for x, record in enumerate(self.iterRecords(bFile,  tickerDecode_MemSize)):
+                oFile.write(self.formatRecord(record))
+
+                #report progress after every block
+                if 0 == (x + 1) % self.blockSize:
+                    self.reportProgress(x + 1)
+
+            self.reportProgress(self.rowCount)
+
+    def encodeBlock(self,  records,  tickerEncode_MemSize):
+        '''
+        Encode a block's records. Column encoded blocks start with the block flags,
+        then each column's encoding picked by the block planner followed by its values.
+        With records grouped by ticker, the block flags are followed by the grouped
+        columns, see decodeColumnBlock(). With repeated fields flagged, the record's repeat masks
+        come first and the columns only hold the changed values.
+
+        Parameters:
+            records (List:Tuple): (condFlags, encodeTickerValue, exchange, side, condition,
+                                   sendTime, timeDiff, price, size)
+            tickerEncode_MemSize (int): encoded ticker's byte memory size
+
+        Attributes:
+            precisions (List:int): price precision of each record
+            prices (List:int): int prices, float prices scaled by their precision
+            blockFlags (int): bit 1 set if float prices are float bits instead of scaled by
+                              their precision, bit 2 set if repeated fields are flagged,
+                              bit 3 set if records are grouped by ticker
+            permutation (List:int): original position of each grouped record
+            groupedColumns (int): bit set per column stored in grouped order
+            repeatMasks (List:int): bit set per field equal to the previous record's
+            repeatData (string): block's encoded records with repeated fields flagged
+
+        Return:
+            blockData (string): block's encoded records
+        '''
+        #records not column encoded
+        if 22 != self.idNumber:
+            blockFile = io.BytesIO()
+            for record in records:
+                self.encodeRecord(blockFile,  record,  tickerEncode_MemSize)
+            return blockFile.getvalue()
+
+        #column encoded blocks
+        blockFlags = 0
+
+        #group records by ticker keeping their order within a ticker, unless already grouped
+        permutation = None
+        if self.groupTickers:
+            permutation = sorted(range(len(records)), key=lambda x: records[x][1])
+            if permutation == range(len(records)):
+                permutation = None
+
+        precisions = [record[0] & 7 for record in records]
+        prices = [int(record[7]) if 0 == precisions[x] else int(round(record[7] * 10 ** precisions[x]))
+                  for x, record in enumerate(records)]
+
+        #scaled float prices must restore the same 4 byte float values, otherwise keep float bits
+        floatRows = [x for x in range(len(records)) if precisions[x]]
+        if floatRows:
+            floatPrices = struct.pack('<{0}f'.format(len(floatRows)), *[records[x][7] for x in floatRows])
+            scaledPrices = struct.pack('<{0}f'.format(len(floatRows)),
+                                       *[prices[x] / float(10 ** precisions[x]) for x in floatRows])
+            if floatPrices != scaledPrices or max([abs(prices[x]) for x in floatRows]) >= 1 << 62:
+                blockFlags |= 1
+                for x, price in zip(floatRows, struct.unpack('<{0}i'.format(len(floatRows)), floatPrices)):
+                    prices[x] = price
+
+        columns = [[record[1] for record in records],
+                   [ord(record[2]) for record in records],
+                   [ord(record[3]) for record in records],
+                   [ord(record[4]) for record in records],
+                   [record[5] for record in records],
+                   [record[6] for record in records],
+                   prices,
+                   [record[8] for record in records],
+                   precisions]
+
+        #store each column in the smaller of the original and grouped order,
+        #the ticker column always in the original order
+        if permutation is not None:
+            groupedColumns = 0
+            columnData = [self.blockPlanner.encodeColumn(columns[0])]
+            for y in range(1, 9):
+                originalData = self.blockPlanner.encodeColumn(columns[y])
+                groupedData = self.blockPlanner.encodeColumn([columns[y][x] for x in permutation])
+                if len(groupedData) < len(originalData):
+                    groupedColumns |= 1 << y
+                    columnData.append(groupedData)
+                else:
+                    columnData.append(originalData)
+            return struct.pack('<BH', blockFlags | 4, groupedColumns) + ''.join(columnData)
+
+        blockData = struct.pack('<B', blockFlags) + ''.join([self.blockPlanner.encodeColumn(column) for column in columns])
+        if not self.repeatFields:
+            return blockData
+
+        #flag fields equal to the previous record's, keep the changed values
+        repeatMasks = [0]
+        for x in range(1, len(records)):
+            repeatMask = 0
+            for y in range(9):
+                if columns[y][x] == columns[y][x - 1]:
+                    repeatMask |= 1 << y
+            repeatMasks.append(repeatMask)
+
+        repeatData = [struct.pack('<B', blockFlags | 2), self.blockPlanner.encodeColumn(repeatMasks)]
+        for y in range(9):
+            changedValues = [columns[y][x] for x in range(len(records)) if not repeatMasks[x] & (1 << y)]
+            if changedValues:
+                repeatData.append(self.blockPlanner.encodeColumn(changedValues))
+        repeatData = ''.join(repeatData)
+
+        #keep repeated fields flagged only if cheaper, counting the slower decode of changed records
+        changedRecords = len([repeatMask for repeatMask in repeatMasks if 511 != repeatMask])
+        if len(repeatData) + self.blockPlanner.getRepeatDecodeCost(changedRecords) < \
+           len(blockData) + self.blockPlanner.getColumnDecodeCost(len(records)):
+            return repeatData
+
+        return blockData
+
+    def encodeBlockIndex(self,  bFile,  blockIndex,  statsData=''):
+        '''
+        Encode the block index after the last block, followed by the file statistics.
+
+        Parameters:
+            bFile (file): file object for compressed file
+            blockIndex (List:Tuple(int,int,int,int)): block's file position, row count,
+                                                      minimum and maximum sendtime
+            statsData (string): encoded file statistics, see encodeStats()
+
+        Attributes:
+            footerOffset (int): file position of the block index
+
+        Return:
+            None
+        '''
+        footerOffset = bFile.tell()
+
+        #encode block index entries (8 bytes, unsigned long long, 4 bytes, unsigned int and 4 bytes each, int)
+        for entry in blockIndex:
+            bFile.write(struct.pack('QIii',*entry))
+        bFile.write(statsData)
+
+        #encode block index position and block count
+        bFile.write(struct.pack('QI',footerOffset,len(blockIndex)))
+
+    def encodeManifest(self,  aFile,  manifest):
+        '''
+        Encode an archive's manifest after its last member.
+
+        Parameters:
+            aFile (file): file object for archive
+            manifest (List:Tuple(string,int,int,int,int,int)): member's name, file position,
+                                                               byte size, row count, minimum
+                                                               and maximum sendtime
+
+        Attributes:
+            manifestOffset (int): file position of the manifest
+
+        Return:
+            None
+        '''
+        manifestOffset = aFile.tell()
+
+        #encode manifest entries, name size (2 bytes, unsigned short) and name, then member
+        #  position, byte size and row count (8 bytes each, unsigned long long) and sendtime range (4 bytes each, int)
+        for entry in manifest:
+            aFile.write(struct.pack('H',len(entry[0])))
+            aFile.write(entry[0])
+            aFile.write(struct.pack('QQQii',*entry[1:]))
+
+        #encode manifest position and member count
+        aFile.write(struct.pack('QI',manifestOffset,len(manifest)))
+
     def encodeHeader(self, bFile):
         '''
         Enocode compressed file's header
@@ -211,7 +887,7 @@ class Compressor(object):
         '''
         
         #message
-        sys.stdout.write('encoding header...')
+        self.output.write('encoding header...')
 
         #size of encoded header in bytes
         #byte sizes for file identifier, number of lines, 
@@ -245,62 +921,148 @@ class Compressor(object):
             for index,value in enumerate(ticker):
                 bFile.write(struct.pack('c',ticker[index]))
 
+        #encode block size (4 bytes, unsigned int)
+        if 19 != self.idNumber:
+            bFile.write(struct.pack('I',self.blockSize))
+            encodeHeader_ByteSize += 4
+
         #printout total encode header byte size
-        sys.stdout.write('total byte size: {0}\n'.format(encodeHeader_ByteSize))
+        self.output.write('total byte size: {0}\n'.format(encodeHeader_ByteSize))
 
-    def encodeTicker(self, bFile,  rowList,  tickerEncode_MemSize):
+    def encodeRecord(self,  bFile,  record,  tickerEncode_MemSize):
         '''
-        Encode ticker.
-        
-        Parameter:
+        Encode a single record from its field values.
+
+        Parameters:
             bFile (file): file object for compressed file
-            rowList (List): holds the line's seperated information
+            record (Tuple): (condFlags, encodeTickerValue, exchange, side, condition,
+                             sendTime, timeDiff, price, size)
             tickerEncode_MemSize (int): encoded ticker's byte memory size
 
         Attributes:
-            encodeTickerValue (int): encoded ticker value
-            
+            timeDiff_Flags (int): condition flags for time difference's byte memory size
+            size_Flags (int): condition flags for line size's byte memory size
+
         Return:
             None
         '''
-        #get ticker encode value
-        encodeTickerValue = self.getEncodeTicker(self.tickerDict,rowList[0].strip(),int(0),len(self.tickerDict)-1)
+        condFlags, encodeTickerValue, exchange, side, condition, sendTime, timeDiff, price, size = record
 
-        #if encoded ticker is not found
-        if -1 == encodeTickerValue:
-            sys.stdout.write(
-              '\nError: unable to find ticker encode value in ticker dictionary.format\n')
-            sys.exit()
+        #get byte memory size flags from condition flags
+        timeDiff_Flags = condFlags & 96
+        size_Flags = condFlags & 24
 
-        #encode ticker using encoded ticker byte memory size
-        if 1 == tickerEncode_MemSize:
+        #encode condition flags (1 byte, char)
+        bFile.write(struct.pack('c',chr(condFlags)))
+
+        #encode ticker
+        self.encodeTicker(bFile,  encodeTickerValue,  tickerEncode_MemSize)
+
+        #encode exchange, side and condition (1 byte each, char)
+        bFile.write(struct.pack('ccc',exchange,side,condition))
+
+        #encode sendtime (4 bytes, int)
+        bFile.write(struct.pack('i',sendTime))
+
+        #encode time difference using condition flags
+        if 0 == timeDiff_Flags:
             #(1 byte, unsigned char)
-            bFile.write(struct.pack('B',int(encodeTickerValue)))
-        elif 2 == tickerEncode_MemSize:
+            bFile.write(struct.pack('B',timeDiff))
+        elif 32 == timeDiff_Flags:
             #(2 bytes, unsigned short)
-            bFile.write(struct.pack('H',encodeTickerValue))
-        elif 4 == tickerEncode_MemSize:
+            bFile.write(struct.pack('H',timeDiff))
+        elif 64 == timeDiff_Flags:
             #(4 bytes, unsigned int)
-            bFile.write(struct.pack('I',encodeTickerValue))
+            bFile.write(struct.pack('I',timeDiff))
 
-    def firstRead(self,  iFileName):
+        #encode price as int or float
+        #NOTE:must write binary in int format if price precision is zero
+        if 0 == condFlags & 7:
+            #(4 bytes, int)
+            bFile.write(struct.pack('i',int(price)))
+        else:
+            #(4 bytes, float)
+            bFile.write(struct.pack('f',price))
+
+        #encode size using condition flags
+        if 0 == size_Flags:
+            #(1 byte, unsigned char)
+            bFile.write(struct.pack('B',size))
+        elif 8 == size_Flags:
+            #(2 bytes, unsigned short)
+            bFile.write(struct.pack('H',size))
+        elif 16 == size_Flags:
+            #(4 bytes, unsigned int)
+            bFile.write(struct.pack('I',size))
+
+    def encodeStats(self,  stats):
         '''
-        Reads the input file to get row count and create TickerList
-        
-        Parameter:
-            iFileName (file): input file
+        Encode the file statistics.
+
+        Parameters:
+            stats (Tuple): minimum and maximum sendtime, byte size per field (see scanBlock())
+                           and row count of each Ticker Dictionary ticker
 
         Attributes:
-            row (string): line information
-            ticker (string): ticker in string value
-            
-        Return:
             None
+
+        Return:
+            statsData (string): encoded file statistics
         '''
-        #NOTE:have to open the input file twice, once to get a row count, other to encode
-        #  unable to detect EOF with reading in the lines
-        sys.stdout.write('building ticker list...\n')
-        with open(iFileName,'rb') as iFile:
+        minSendTime, maxSendTime, fieldBytes, tickerCounts = stats
+
+        #encode sendtime range (4 bytes each, int) and byte size per field (8 bytes each, unsigned long long)
+        statsData = struct.pack('<ii10Q', minSendTime, maxSendTime, *fieldBytes)
+        #encode row count of each ticker as a column
+        if tickerCounts:
+            statsData += self.blockPlanner.encodeColumn(tickerCounts)
+
+        return statsData
+
+    def encodeTicker(self, bFile,  encodeTickerValue,  tickerEncode_MemSize):
+        '''
+        Encode ticker.
+        
+        Parameter:
+            bFile (file): file object for compressed file
+            encodeTickerValue (int): encoded ticker value
+            tickerEncode_MemSize (int): encoded ticker's byte memory size
+
+        Attributes:
+            None
+            
+        Return:
+            None
+        '''
+        #encode ticker using encoded ticker byte memory size
+        if 1 == tickerEncode_MemSize:
+            #(1 byte, unsigned char)
+            bFile.write(struct.pack('B',int(encodeTickerValue)))
+        elif 2 == tickerEncode_MemSize:
+            #(2 bytes, unsigned short)
+            bFile.write(struct.pack('H',encodeTickerValue))
+        elif 4 == tickerEncode_MemSize:
+            #(4 bytes, unsigned int)
+            bFile.write(struct.pack('I',encodeTickerValue))
+
+    def firstRead(self,  iFileName):
+        '''
+        Reads the input file to get row count and create TickerList
+        
+        Parameter:
+            iFileName (file): input file
+
+        Attributes:
+            row (string): line information
+            ticker (string): ticker in string value
+            
+        Return:
+            None
+        '''
+        #NOTE:have to open the input file twice, once to get a row count, other to encode
+        #  unable to detect EOF with reading in the lines
+        self.output.write('building ticker list...\n')
+        with open(iFileName,'rb') as iFile:
             while True:
                 row = iFile.readline()
                 if not row: break
@@ -311,6 +1073,36 @@ class Compressor(object):
                 #get row count
                 self.rowCount += 1
 
+    def formatRecord(self,  record):
+        '''
+        Format decoded record as a BAT file line.
+
+        Parameters:
+            record (Tuple): (condFlags, decodeIndex, exchange, side, condition,
+                             sendTime, timeDiff, price, size)
+
+        Attributes:
+            pricePrecision (int): condition flags for the number of digits right of line 
+                                  price's decimal point
+            precisionFormat (string): output format for decoded price precision
+
+        Return:
+            line (string): BAT file line with Microsoft newline
+        '''
+        condFlags, decodeIndex, exchange, side, condition, sendTime, timeDiff, price, size = record
+
+        #get price precision from condition flags
+        pricePrecision = condFlags & 7
+
+        #must decode price precision in float format with change precision if nonzero 
+        if pricePrecision:
+            precisionFormat = '{0:.' + str(pricePrecision) + 'f}'
+            price = precisionFormat.format(price)
+
+        #ticker, exchange, side, condition, sendtime, receivetime, price, size
+        return '{0},{1},{2},{3},{4},{5},{6},{7}\r\n'.format(self.tickerDict[decodeIndex], exchange, side, condition,
+                                                          sendTime, sendTime + timeDiff, price, size)
+
     def getEncodeTicker(self, tickerDict, tickerName, minIndex, maxIndex):
         '''
         get encoded ticker during compression by performing a binary search 
@@ -353,6 +1145,63 @@ class Compressor(object):
         else:
             return splitIndex 
 
+    def getInfo(self,  bFileName):
+        '''
+        Get a compressed file's information from its header and file statistics
+        without reading its blocks.
+
+        Parameters:
+            bFileName (string): compressed file
+
+        Attributes:
+            decoder (Compressor): decodes the file's header and statistics
+            stats (Tuple): see encodeStats(), None if the file has no statistics
+
+        Return:
+            info (Dict): file name, file identifier, row count, block count, block size,
+                         Ticker Dictionary, row count per ticker, minimum and maximum
+                         sendtime, header, field and file byte sizes and the field names
+                         in file order (column encoded blocks store the price precision
+                         instead of the condition flags). Values the file
+                         has no statistics for are None, the sendtime range is None if
+                         the file has no records
+        '''
+        decoder = Compressor()
+        decoder.messages = False
+
+        with open(bFileName, 'rb') as bFile:
+            decoder.decodeHeader(bFile)
+            info = {'fileName':bFileName, 'idNumber':decoder.idNumber, 'rowCount':decoder.rowCount,
+                    'blockCount':None, 'blockSize':None, 'tickerDict':decoder.tickerDict,
+                    'tickerCounts':None, 'minSendTime':None, 'maxSendTime':None,
+                    'headerBytes':bFile.tell(), 'fieldBytes':None, 'fileBytes':os.path.getsize(bFileName),
+                    'fieldNames':['ticker', 'exchange', 'side', 'condition', 'sendtime', 'time difference',
+                                  'price', 'size', 'precision' if 22 == decoder.idNumber else 'condition flags',
+                                  'blocks and index']}
+
+            #records only files have no block index or statistics
+            if 19 == decoder.idNumber:
+                return info
+            info['blockSize'] = decoder.blockSize
+
+            info['blockCount'], stats = decoder.decodeStats(bFile)
+            if stats is not None:
+                #files without records store an empty sendtime range as zeros
+                if decoder.rowCount:
+                    info['minSendTime'], info['maxSendTime'] = stats[:2]
+                fieldBytes, tickerCounts = stats[2:]
+                info['tickerCounts'] = dict(zip(decoder.tickerDict, tickerCounts))
+                info['fieldBytes'] = dict(zip(info['fieldNames'], fieldBytes))
+
+            #files written without statistics get the sendtime range from the block index
+            elif info['blockCount']:
+                bFile.seek(info['headerBytes'])
+                blockIndex = decoder.decodeBlockIndex(bFile)
+                info['minSendTime'] = min([entry[2] for entry in blockIndex])
+                info['maxSendTime'] = max([entry[3] for entry in blockIndex])
+
+        return info
+
     def getTickerEncode_MemSize(self):
         '''
         Get encoded ticker's byte memory size
@@ -382,6 +1231,414 @@ class Compressor(object):
            
         return tickerEncode_MemSize
         
+    def indexRecords(self,  bFile,  tickerDecode_MemSize):
+        '''
+        Index a compressed file without blocks by scanning its records once,
+        grouping them into blocks of block size records.
+
+        Parameters:
+            bFile (file): file object for compressed file, positioned at the first record
+            tickerDecode_MemSize (int): encoded ticker's byte memory size to be decoded
+
+        Attributes:
+            blockOffset (int): file position of the block being indexed
+
+        Return:
+            blockIndex (List:Tuple(int,int,int,int)): block's file position, row count,
+                                                      minimum and maximum sendtime
+            blockSpans (List:Tuple(int,int)): file position and byte size of each block's records
+        '''
+        blockIndex = []
+        blockSpans = []
+        blockOffset = bFile.tell()
+        blockRows = 0
+
+        for x in range(self.rowCount):
+            sendTime = self.decodeRecord(bFile,  tickerDecode_MemSize)[5]
+            if 0 == blockRows:
+                minSendTime = maxSendTime = sendTime
+            else:
+                minSendTime = min(minSendTime, sendTime)
+                maxSendTime = max(maxSendTime, sendTime)
+            blockRows += 1
+
+            #close block
+            if blockRows == self.blockSize or x == self.rowCount - 1:
+                blockIndex.append((blockOffset, blockRows, minSendTime, maxSendTime))
+                blockSpans.append((blockOffset, bFile.tell() - blockOffset))
+                blockOffset = bFile.tell()
+                blockRows = 0
+
+        return blockIndex, blockSpans
+
+    def iterBlocks(self,  bFile):
+        '''
+        Iterate through the compressed file's blocks without decoding them. Blocks are
+        read using the block index and checked, see readBlock().
+
+        Parameters:
+            bFile (file): file object for compressed file, header already decoded
+
+        Attributes:
+            blockSpans (List:Tuple(int,int,int)): see decodeBlockSpans()
+            checksums (List:int): CRC32 of each block's records, None for each block if the
+                                  file has no checksums
+
+        Return:
+            (blockRows, blockData) generator
+        '''
+        blockSpans = self.decodeBlockSpans(bFile)
+        checksums = self.decodeChecksums(bFile) or [None] * len(blockSpans)
+
+        for blockNumber, blockSpan in enumerate(blockSpans):
+            blockData = self.readBlock(bFile,  blockNumber,  blockSpan,  checksums[blockNumber])
+            if blockData is not None:
+                yield (blockSpan[1], blockData)
+
+    def iterRecords(self,  bFile,  tickerDecode_MemSize):
+        '''
+        Iterate through the compressed file's records after its header is decoded.
+
+        Parameters:
+            bFile (file): file object for compressed file
+            tickerDecode_MemSize (int): encoded ticker's byte memory size to be decoded
+
+        Attributes:
+            None
+
+        Return:
+            record (Tuple) generator, see decodeRecord()
+        '''
+        #records only
+        if 19 == self.idNumber:
+            for x in range(self.rowCount):
+                yield self.decodeRecord(bFile,  tickerDecode_MemSize)
+            return
+
+        #records in blocks
+        for blockRows, blockData in self.iterBlocks(bFile):
+            for record in self.decodeBlock(blockData,  blockRows,  tickerDecode_MemSize):
+                yield record
+
+    def iterSpilledBlocks(self,  spillFile):
+        '''
+        Iterate through the blocks spilled to a temporary file.
+
+        Parameters:
+            spillFile (file): temporary file holding the spilled blocks, positioned at the first
+
+        Attributes:
+            blockRows (int): number of records in the block
+            blockByteSize (int): byte size of the block's records
+
+        Return:
+            (blockRows, minSendTime, maxSendTime, blockData) generator
+        '''
+        while True:
+            spillHeader = spillFile.read(struct.calcsize('IiiI'))
+            if not spillHeader:
+                break
+            blockRows, minSendTime, maxSendTime, blockByteSize = struct.unpack('IiiI',spillHeader)
+            yield blockRows, minSendTime, maxSendTime, spillFile.read(blockByteSize)
+
+    def mergeSource(self,  index,  bFile,  tickerDecode_MemSize):
+        '''
+        Iterate through the compressed file's records as merge keys.
+
+        Parameters:
+            index (int): input's position in the merge, used to order equal sendtimes
+            bFile (file): file object for compressed file
+            tickerDecode_MemSize (int): encoded ticker's byte memory size to be decoded
+
+        Attributes:
+            lastSendTime (int): previous record's sendtime
+
+        Return:
+            (sendTime, index, row index, record) generator
+        '''
+        lastSendTime = None
+        for x, record in enumerate(self.iterRecords(bFile,  tickerDecode_MemSize)):
+            #merge relies on the input being in sendtime order
+            if lastSendTime > record[5]:
+                self.output.write('Warning: merge input #{0} not in sendtime order on row {1}\n'.format(index, x))
+            lastSendTime = record[5]
+            yield (record[5], index, x, record)
+
+    def openBlockWriter(self,  oFileName,  tickerDict):
+        '''
+        Open a compressed file sharing this file's block size for writing records.
+
+        Parameters:
+            oFileName (string): compressed file to be written
+            tickerDict (List:string): output file's Ticker Dictionary
+
+        Attributes:
+            output (Compressor): holds the output file's Ticker Dictionary
+
+        Return:
+            blockWriter (BlockWriter): writer for the output file, close both the writer and its file
+        '''
+        output = Compressor()
+        output.output = self.output
+        output.tickerDict = tickerDict
+        output.blockSize = self.blockSize
+
+        #copied blocks must keep the block layout
+        if 19 != self.idNumber:
+            output.idNumber = self.idNumber
+
+        return BlockWriter(output,  open(oFileName, 'wb'))
+
+    def parseRecord(self,  rowList,  encodeTickerValue=None):
+        '''
+        Parse a BAT file line into the field values to be encoded.
+
+        Parameters:
+            rowList (List): holds the line's seperated information
+            encodeTickerValue (int): encoded ticker value, looked up in the Ticker Dictionary if None
+
+        Attributes:
+            condFlags (int): condition flags for line byte memory size, combination 
+                             of timDiff_Flags, size_Flags and price precision
+            encodeTickerValue (int): encoded ticker value
+
+        Return:
+            record (Tuple): (condFlags, encodeTickerValue, exchange, side, condition,
+                             sendTime, timeDiff, price, size)
+        '''
+        #set condition flags
+        condFlags = self.setCondFlags(rowList,  0,  0,  0,  0)[0]
+
+        #get ticker encode value
+        if encodeTickerValue is None:
+            encodeTickerValue = self.getEncodeTicker(self.tickerDict,rowList[0].strip(),int(0),len(self.tickerDict)-1)
+
+        #if encoded ticker is not found
+        if -1 == encodeTickerValue:
+            raise CompressorError(
+              'Error: unable to find ticker encode value in ticker dictionary for {0}'.format(rowList[0].strip()))
+
+        #get sendtime and time difference
+        sendTime = int(rowList[4].strip())
+        timeDiff = int(rowList[5].strip()) - sendTime
+
+        return (condFlags, encodeTickerValue, rowList[1].strip(), rowList[2].strip(), rowList[3].strip(),
+                sendTime, timeDiff, float(rowList[6].strip()), int(rowList[7].strip()))
+
+    def readBlock(self,  bFile,  blockNumber,  blockSpan,  checksum):
+        '''
+        Read a block at its position in the block index. The block's header must match
+        the block index and its records must match the block's checksum.
+
+        Parameters:
+            bFile (file): file object for compressed file
+            blockNumber (int): block's position in the block index
+            blockSpan (Tuple(int,int,int)): block's file position, row count and byte size,
+                                            see decodeBlockSpans()
+            checksum (int): CRC32 of the block's records, None if the file has no checksums
+
+        Attributes:
+            blockHeader (string): block's row count and byte size as stored with the block
+            damage (string): why the block is damaged
+
+        Return:
+            blockData (string): block's encoded records, None if the block is damaged
+                                and damaged blocks are skipped
+        '''
+        blockOffset, blockRows, blockByteSize = blockSpan
+        bFile.seek(blockOffset)
+        blockHeader = bFile.read(8)
+        blockData = bFile.read(blockByteSize)
+
+        if len(blockHeader) != 8 or struct.unpack('II',blockHeader) != (blockRows, blockByteSize) or \
+           len(blockData) != blockByteSize:
+            damage = 'header does not match the block index'
+        elif checksum is not None and zlib.crc32(blockData) & 0xffffffff != checksum:
+            damage = 'checksum mismatch'
+        else:
+            return blockData
+
+        if not self.skipDamaged:
+            raise CompressorError('Block {0} is damaged: {1}'.format(blockNumber, damage))
+
+        #message
+        self.output.write('skipping damaged block {0}\n'.format(blockNumber))
+        return None
+
+    def remapTickerColumn(self,  blockData,  blockRows,  tickerRemap):
+        '''
+        Renumber the encoded tickers of a column encoded block not grouped by ticker,
+        re-encoding only its ticker column.
+
+        Parameters:
+            blockData (string): block's encoded records
+            blockRows (int): number of records in the block
+            tickerRemap (List:int): new encoded ticker of each encoded ticker
+
+        Attributes:
+            blockFlags (int): see decodeBlock()
+            tickerRows (int): number of values in the ticker column
+            columnEnd (int): position after the ticker column
+
+        Return:
+            blockData (string): block's encoded records with the renumbered tickers
+        '''
+        blockFlags = struct.unpack_from('<B', blockData)[0]
+        offset = 1
+        tickerRows = blockRows
+
+        #with repeated fields flagged, the ticker column holds the changed tickers after the repeat masks
+        if blockFlags & 2:
+            repeatMasks, offset = self.blockPlanner.decodeColumn(blockData,  offset,  blockRows)
+            tickerRows = len([repeatMask for repeatMask in repeatMasks if not repeatMask & 1])
+
+        tickers, columnEnd = self.blockPlanner.decodeColumn(blockData,  offset,  tickerRows)
+
+        return blockData[:offset] + \
+               self.blockPlanner.encodeColumn([tickerRemap[ticker] for ticker in tickers]) + \
+               blockData[columnEnd:]
+
+    def reportProgress(self,  rowsDone):
+        '''
+        Report progress and check for cancellation.
+
+        Parameters:
+            rowsDone (int): number of records compressed or decompressed
+
+        Attributes:
+            None
+
+        Return:
+            None
+        '''
+        if self.cancelEvent is not None and self.cancelEvent.is_set():
+            raise CompressorCancelled('Cancelled after {0} of {1} records'.format(rowsDone, self.rowCount))
+
+        if self.progress is not None:
+            self.progress(rowsDone, self.rowCount)
+
+    def routeBlocks(self,  bFile,  tickerDecode_MemSize,  blockRoute,  recordRoute):
+        '''
+        Route the compressed file's records to block writers. Whole blocks are copied
+        or skipped using the block index, only the remaining blocks are decoded.
+        NOTE: files without blocks have every record decoded and routed.
+
+        Parameters:
+            bFile (file): file object for compressed file, positioned after the header
+            tickerDecode_MemSize (int): encoded ticker's byte memory size to be decoded
+            blockRoute (function): given a block's minimum and maximum sendtime, returns
+                                   ('copy', BlockWriter), ('skip', None) or ('decode', None)
+            recordRoute (function): given a record, returns (BlockWriter, record) or None to drop it
+
+        Attributes:
+            blockIndex (List:Tuple(int,int,int,int)): block's file position, row count,
+                                                      minimum and maximum sendtime
+
+        Return:
+            None
+        '''
+        #records only
+        if 19 == self.idNumber:
+            for record in self.iterRecords(bFile,  tickerDecode_MemSize):
+                route = recordRoute(record)
+                if route:
+                    route[0].add(route[1])
+            return
+
+        #records in blocks, damaged blocks are neither copied nor decoded
+        blockIndex = self.decodeBlockIndex(bFile)
+        blockSpans = self.decodeBlockSpans(bFile)
+        checksums = self.decodeChecksums(bFile) or [None] * len(blockIndex)
+        for blockNumber, (blockOffset, blockRows, minSendTime, maxSendTime) in enumerate(blockIndex):
+            action, blockWriter = blockRoute(minSendTime, maxSendTime)
+            if 'skip' == action:
+                continue
+
+            blockData = self.readBlock(bFile,  blockNumber,  blockSpans[blockNumber],  checksums[blockNumber])
+            if blockData is None:
+                continue
+
+            #copy block without decoding its records
+            if 'copy' == action:
+                blockWriter.copyBlock(blockRows,  minSendTime,  maxSendTime,  blockData)
+            #decode block and route its records
+            else:
+                for record in self.decodeBlock(blockData,  blockRows,  tickerDecode_MemSize):
+                    route = recordRoute(record)
+                    if route:
+                        route[0].add(route[1])
+
+    def scanBlock(self,  blockData,  blockRows,  tickerEncode_MemSize):
+        '''
+        Get a block's encoded byte size per field and its encoded tickers, decoding
+        only the ticker values.
+
+        Parameters:
+            blockData (string): block's encoded records
+            blockRows (int): number of records in the block
+            tickerEncode_MemSize (int): encoded ticker's byte memory size
+
+        Attributes:
+            fieldCounts (List:int): number of values stored per column
+            repeatMasks (List:int): repeated fields of each record, see decodeRepeatBlock()
+
+        Return:
+            fieldBytes (List:int): byte size of the ticker, exchange, side, condition, sendtime,
+                                   time difference, price, size and condition flags (price
+                                   precision in column encoded blocks) fields followed by
+                                   the block's other bytes
+            tickers (List:int): encoded ticker of each record
+        '''
+        fieldBytes = [0] * 10
+
+        #records not column encoded, field sizes from the condition flags
+        if 22 != self.idNumber:
+            tickerFormat = {1:'B', 2:'H', 4:'I'}[tickerEncode_MemSize]
+            tickers = []
+            offset = 0
+            for x in range(blockRows):
+                condFlags = ord(blockData[offset])
+                tickers.append(struct.unpack_from(tickerFormat, blockData, offset + 1)[0])
+                timeDiffSize = 4 if condFlags & 64 else 2 if condFlags & 32 else 1
+                sizeSize = 4 if condFlags & 16 else 2 if condFlags & 8 else 1
+                fieldBytes[5] += timeDiffSize
+                fieldBytes[7] += sizeSize
+                offset += 12 + tickerEncode_MemSize + timeDiffSize + sizeSize
+            for x, fieldSize in ((0, tickerEncode_MemSize), (1, 1), (2, 1), (3, 1), (4, 4), (6, 4), (8, 1)):
+                fieldBytes[x] = fieldSize * blockRows
+            return fieldBytes, tickers
+
+        #block flags and grouped column mask
+        blockFlags = ord(blockData[0])
+        offset = 3 if blockFlags & 4 else 1
+
+        #repeated fields flagged, columns only hold the changed values
+        fieldCounts = [blockRows] * 9
+        repeatMasks = None
+        if blockFlags & 2:
+            repeatMasks, offset = self.blockPlanner.decodeColumn(blockData,  offset,  blockRows)
+            fieldCounts = [blockRows - len([mask for mask in repeatMasks if mask & (1 << x)]) for x in range(9)]
+        fieldBytes[9] = offset
+
+        for x in range(9):
+            if not fieldCounts[x]:
+                continue
+            if 0 == x:
+                tickers, columnEnd = self.blockPlanner.decodeColumn(blockData,  offset,  fieldCounts[x])
+            else:
+                columnEnd = self.blockPlanner.skipColumn(blockData,  offset,  fieldCounts[x])
+            fieldBytes[x] = columnEnd - offset
+            offset = columnEnd
+
+        #repeat the unchanged tickers
+        if repeatMasks is not None:
+            changedTickers = iter(tickers)
+            tickers = []
+            for repeatMask in repeatMasks:
+                tickers.append(tickers[-1] if repeatMask & 1 else next(changedTickers))
+
+        return fieldBytes, tickers
+
     def setCondFlags(self,  rowList,  condFlags,  timeDiff_Flags,  size_Flags,  pricePrecision):
         '''
         Set condition flags
@@ -432,7 +1689,7 @@ class Compressor(object):
             #NOTE: price precison value > 7 will alter other condition flags, 
             #  compressing erroneous data
             if pricePrecision > 7:
-                sys.stdout.write(
+                self.output.write(
                   'Warning: passed max price precision on row {0}, precision degraded\n'.format(index))
                 pricePrecision = 7
    
@@ -471,140 +1728,327 @@ class Compressor(object):
         elif value >= 65536:
             return byteAllocArray[arrayIndex][2]
 
-    def compress(self, iFileName, bFileName):
+    def spillBlock(self,  spillFile,  records):
         '''
-        Compresses and encodes the BAT file.
+        Encode a block's records to a temporary file, tickers are encoded with 4 bytes.
 
         Parameters:
-            iFileName (string): BAT file to be compressed
-            bFileName (string): compressed file
+            spillFile (file): temporary file holding the spilled blocks
+            records (List:Tuple): see parseRecord()
 
-        Attributes:            
-            rowList (List): holds the line's seperated information  
+        Attributes:
+            blockData (string): block's encoded records
 
-            tickerDict_Length (int): the number of tickers from the BAT file
-            tickerEncode_MemSize (int): encoded ticker's byte memory size
+        Return:
+            None
+        '''
+        sendTimes = [record[5] for record in records]
+        blockData = self.encodeBlock(records,  4)
 
-            metaData_ByteSize (int): the metadata's size in bytes 
+        #encode row count, sendtime range and byte size (4 bytes each)
+        spillFile.write(struct.pack('IiiI',len(records),min(sendTimes),max(sendTimes),len(blockData)))
+        spillFile.write(blockData)
 
-            ticker (string): line ticker value
+    def writeNpyHeader(self, cFile, dtype, rowCount):
+        '''
+        Writes a NumPy .npy (version 1.0) header for a one dimensional column.
 
-            timeDiff (int): time difference between the line send time and receive time
+        Parameters:
+            cFile (file): file object for column file
+            dtype (string): NumPy type descriptor of the column (ie - '<i4')
+            rowCount (int): number of elements in the column
 
-            condFlags (int): condition flags for line byte memory size, combination 
-                             of timDiff_Flags, size_Flags and price precision
-                          
-            timeDiff_Flags (int): condition flags for time difference's byte memory size
-            size_Flags (int): condition flags for line size's byte memory size
+        Attributes:
+            header (string): header dictionary, padded so the column data is 64 byte aligned
 
-            pricePrecision (int): condition flags for the number of digits right of line 
-                                  price's decimal point
+        Return:
+            None
+        '''
+        header = "{{'descr': '{0}', 'fortran_order': False, 'shape': ({1},), }}".format(dtype, rowCount)
+        #magic string (6 bytes), version (2 bytes), header length (2 bytes) and newline
+        header = header + ' ' * (63 - (10 + len(header)) % 64) + '\n'
+
+        cFile.write('\x93NUMPY\x01\x00')
+        cFile.write(struct.pack('<H',len(header)))
+        cFile.write(header)
+
+    def archive(self, iPattern, aFileName, workers=None):
+        '''
+        Compress many BAT files into one archive with a manifest. Files are compressed
+        in parallel by a pool of worker processes, with this compressor's settings, and
+        appended to the archive in name order. The manifest records each member's name,
+        position, byte size, row count and sendtime range so members can be extracted
+        without reading the others. The workers' messages are written in name order.
+
+        Parameters:
+            iPattern (string): directory of .csv files or glob pattern of BAT files
+            aFileName (string): archive
+            workers (int): number of worker processes, one per cpu if None
+
+        Attributes:
+            iFileNames (List:string): BAT files to be archived
+            tempDir (string): directory for the compressed members before they are archived
+            settings (Tuple): ticker structure class, file identifier, block size, repeated
+                              fields flagging and ticker grouping of the workers
+            manifest (List:Tuple(string,int,int,int,int,int)): member's name, file position,
+                                                               byte size, row count, minimum
+                                                               and maximum sendtime
 
         Return:
             None
         '''
         #message
-        sys.stdout.write('begin compression...\n')
+        self.output.write('begin archive...\n')
 
-        #setup row count
-        self.rowCount = 0
-        
-        #read input file to get row cont and create TickerList
-        self.firstRead(iFileName)
+        #get BAT files to be archived
+        if os.path.isdir(iPattern):
+            iFileNames = sorted(glob.glob(os.path.join(iPattern, '*.csv')))
+        else:
+            iFileNames = sorted(glob.glob(iPattern))
+        if not iFileNames:
+            raise CompressorError('No input files match \'{0}\''.format(iPattern))
+
+        #archive member names must be unique
+        memberNames = [os.path.basename(iFileName) for iFileName in iFileNames]
+        if len(set(memberNames)) != len(memberNames):
+            raise CompressorError('Input file names must be unique within the archive')
+
+        #compressed members are written next to the archive before being appended
+        tempDir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(aFileName)))
+        pool = multiprocessing.Pool(workers)
+        try:
+            settings = (type(self.tickerStruct), self.idNumber, self.blockSize, self.repeatFields,
+                        self.groupTickers)
+            tasks = [(iFileName, os.path.join(tempDir, '{0}.bin'.format(index)), settings)
+                     for index, iFileName in enumerate(iFileNames)]
+
+            with open(aFileName, 'wb') as aFile:
+                #encode archive identifier (2 bytes, unsigned short)
+                aFile.write(struct.pack('H',21))
+
+                manifest = []
+                for memberName, bFileName, rowCount, minSendTime, maxSendTime, messages in \
+                  pool.imap(archiveMember, tasks):
+                    self.output.write(messages)
+
+                    #append compressed member
+                    memberOffset = aFile.tell()
+                    with open(bFileName, 'rb') as bFile:
+                        shutil.copyfileobj(bFile, aFile)
+                    os.remove(bFileName)
+
+                    manifest.append((memberName, memberOffset, aFile.tell() - memberOffset,
+                                     rowCount, minSendTime, maxSendTime))
+
+                #encode manifest
+                self.encodeManifest(aFile,  manifest)
+
+            pool.close()
+        finally:
+            pool.terminate()
+            shutil.rmtree(tempDir)
 
-        #build ticker dictionary
-        #self.tickerList.buildTickerDict(self.tickerDict)
-        self.tickerStruct.buildTickerDict(self.tickerDict)
- 
-        #get ticker dictionary length
-        tickerDict_Length = len(self.tickerDict)
- 
-        #get encoded ticker's byte memory size
-        tickerEncode_MemSize = self.getTickerEncode_MemSize()
+        #message
+        self.output.write('archive complete, {0} members\n'.format(len(manifest)))
+
+    def compress(self, iFileName, bFileName):
+        '''
+        Compresses and encodes the BAT file.
+
+        Parameters:
+            iFileName (string): BAT file to be compressed
+            bFileName (string): compressed file
+
+        Attributes:            
+            rowList (List): holds the line's seperated information  
+
+            blockWriter (BlockWriter): encodes the header, records in blocks and block index
+
+            metaData_ByteSize (int): the metadata's size in bytes 
+
+        Return:
+            None
+        '''
+        #message
+        self.output.write('begin compression...\n')
+
+        #setup row count
+        self.rowCount = 0
         
+        #read input file to get row cont and create TickerList
+        self.firstRead(iFileName)
+
+        #build ticker dictionary
+        #self.tickerList.buildTickerDict(self.tickerDict)
+        self.tickerStruct.buildTickerDict(self.tickerDict)
+ 
         #open input file again and read/encode line data
         with open(iFileName,'rb') as iFile:
             with open(bFileName, 'wb') as bFile:
 
-                #encode header
-                self.encodeHeader(bFile)   
-                
-                #message
-                sys.stdout.write('encoding records...')
+                #pipelined mode reads input chunks and writes blocks on their own threads
+                lineReader = None
+                output = bFile
+                lines = iter(iFile.readline, '')
+                if self.pipelineDepth:
+                    lineReader = pipeline.ChunkReader(
+                      iter(lambda: iFile.readlines(self.chunkSize), []),  self.pipelineDepth)
+                    output = pipeline.QueuedWriter(bFile,  self.pipelineDepth)
+                    lines = itertools.chain.from_iterable(lineReader)
+
+                try:
+                    #encode header
+                    blockWriter = BlockWriter(self,  output)
+                    
+                    #message
+                    self.output.write('encoding records...')
 
-                #meta-data count
-                metaData_ByteSize = 0
+                    #meta-data count
+                    metaData_ByteSize = 0
 
-                #read from the input records
-                for index in range(self.rowCount):
-                    rowList = iFile.readline().split(',')
+                    #read from the input records
+                    for line in itertools.islice(lines, self.rowCount):
+                        rowList = line.split(',')
 
-                    #setup condition flags
-                    condFlags = 0
-                    timeDiff_Flags = 0
-                    size_Flags = 0
-                    pricePrecision = 0            
+                        #parse line information into record and encode it
+                        blockWriter.add(self.parseRecord(rowList))
 
-                    #set condition flags
-                    condFlags,  timeDiff_Flags,  size_Flags,  pricePrecision = \
-                      self.setCondFlags(rowList,  condFlags,  timeDiff_Flags,  size_Flags,  pricePrecision)
-                    
-                    #encode condition flags (1 byte, char)
-                    bFile.write(struct.pack('c',chr(condFlags)))
-
-                    #add to meta data
-                    metaData_ByteSize += 1
-
-                    #encode ticker
-                    self.encodeTicker(bFile,  rowList,  tickerEncode_MemSize)
-
-                    #encode exchange, side and condition (1 byte each, char)
-                    bFile.write(struct.pack('c',rowList[1].strip()))
-                    bFile.write(struct.pack('c',rowList[2].strip()))
-                    bFile.write(struct.pack('c',rowList[3].strip()))
-
-                    #encode sendtime (4 bytes, int)
-                    bFile.write(struct.pack('i',int(rowList[4].strip())))
-
-                    #get time difference
-                    timeDiff = int(rowList[5].strip()) - int(rowList[4].strip())
-                                                            
-                    #encode time difference using condition flags
-                    if 0 == timeDiff_Flags:
-                        #(1 byte, unsigned char)
-                        bFile.write(struct.pack('B',int(timeDiff)))
-                    elif 32 == timeDiff_Flags:
-                        #(2 bytes, unsigned short)
-                        bFile.write(struct.pack('H',int(timeDiff)))
-                    elif 64 == timeDiff_Flags:
-                        #(4 bytes, unsigned int)
-                        bFile.write(struct.pack('I',int(timeDiff)))
-
-                    #encode price as int or float
-                    #NOTE:must write binary in int format if price precision is zero
-                    if 0 == pricePrecision: 
-                        #(4 bytes, int)
-                        bFile.write(struct.pack('i',float(rowList[6].strip())))
-                    else:
-                        #(4 bytes, float)
-                        bFile.write(struct.pack('f',float(rowList[6].strip())))
-
-                    #encode size using condition flags
-                    if 0 == size_Flags:
-                        #(1 byte, unsigned char)
-                        bFile.write(struct.pack('B',int(rowList[7].strip())))
-                    elif 8 == size_Flags:
-                        #(2 bytes, unsigned short)
-                        bFile.write(struct.pack('H',int(rowList[7].strip())))
-                    elif 16 == size_Flags:
-                        #(4 bytes, unsigned int)
-                        bFile.write(struct.pack('I',int(rowList[7].strip())))
+                        #add condition flags to meta data
+                        metaData_ByteSize += 1
+
+                        #report progress after every block
+                        if 0 == metaData_ByteSize % self.blockSize:
+                            self.reportProgress(metaData_ByteSize)
+
+                    #encode last block and block index
+                    blockWriter.close()
+                    self.reportProgress(self.rowCount)
+                finally:
+                    if lineReader is not None:
+                        lineReader.close()
+                    if output is not bFile:
+                        output.close()
 
         #printout total meta data byte size
-        sys.stdout.write('total metadata byte size: {0}\n'.format(metaData_ByteSize))
+        self.output.write('total metadata byte size: {0}\n'.format(metaData_ByteSize))
+
+        #message
+        self.output.write('compression complete\n')
+
+    def compressStream(self, iFile, bFileName):
+        '''
+        Compresses and encodes the BAT file in a single pass within the memory budget,
+        so piped input and files larger than memory can be compressed. Blocks are encoded
+        with tickers numbered in order of appearance and spilled to a temporary file,
+        then renumbered to the Ticker Dictionary's order while writing the compressed file.
+        Column encoded blocks not grouped by ticker only have their ticker column re-encoded.
+        NOTE: the Ticker Dictionary is limited to 65535 tickers by the header and is kept
+        in memory, it is given half of the memory budget.
+        NOTE: the memory budget is an estimate from fixed record and ticker byte sizes,
+        memory is not measured or enforced and the interpreter itself is not counted.
+
+        Parameters:
+            iFile (file): file object for BAT file, may be a pipe
+            bFileName (string): compressed file
+
+        Attributes:
+            blockRows (int): records per block, two blocks fitting in half of the memory budget
+            tickerCodes (Dict): ticker to its number in order of appearance
+            tickerBytes (int): estimated byte size of the tickers held in memory
+            spillFile (file): temporary file holding the spilled blocks
+            tickerRemap (List:int): Ticker Dictionary index of each ticker number
+            records (List:Tuple): spilled block's records renumbered to the Ticker Dictionary
+            blockWriter (BlockWriter): encodes the header, records in blocks and block index
+
+        Return:
+            None
+        '''
+        #message
+        self.output.write('begin single pass compression...\n')
+
+        #estimated byte size of a record held in a block and of a ticker held in memory
+        recordBytes = 600
+        tickerBytesEach = 120
+
+        #half of the memory budget holds the tickers, the other half two buffers of a block:
+        #its records and their encoded columns, or a spilled block's decoded and re-encoded records
+        tickerBudget = self.memoryBudget // 2
+        blockRows = max(1, min(self.blockSize, (self.memoryBudget - tickerBudget) // (2 * recordBytes)))
+
+        tickerCodes = {}
+        tickerBytes = 0
+        rowCount = 0
+        with tempfile.TemporaryFile() as spillFile:
+            #message
+            self.output.write('spilling blocks...\n')
+
+            blockRecords = []
+            for line in iter(iFile.readline, ''):
+                rowList = line.split(',')
+                ticker = rowList[0].strip()
+
+                #number new tickers in order of appearance
+                if ticker not in tickerCodes:
+                    tickerBytes += len(ticker) + tickerBytesEach
+                    if len(tickerCodes) == 65535 or tickerBytes > tickerBudget:
+                        raise CompressorError('Too many tickers for the memory budget or Ticker Dictionary '
+                                              'after {0} tickers'.format(len(tickerCodes)))
+                    tickerCodes[ticker] = len(tickerCodes)
+
+                blockRecords.append(self.parseRecord(rowList,  tickerCodes[ticker]))
+                rowCount += 1
+
+                #spill full block
+                if len(blockRecords) == blockRows:
+                    self.spillBlock(spillFile,  blockRecords)
+                    blockRecords = []
+                    self.reportProgress(rowCount)
+            if blockRecords:
+                self.spillBlock(spillFile,  blockRecords)
+                blockRecords = []
+
+            #build ticker dictionary and renumber the tickers to its order
+            self.tickerDict = sorted(tickerCodes)
+            tickerRemap = [0] * len(tickerCodes)
+            for tickerIndex, ticker in enumerate(self.tickerDict):
+                tickerRemap[tickerCodes[ticker]] = tickerIndex
+            tickerCodes = None
+            self.rowCount = rowCount
+
+            #message
+            self.output.write('encoding records...\n')
+
+            #blocks are copied when the numbering already matches the ticker dictionary
+            copyBlocks = tickerRemap == range(len(tickerRemap)) and \
+                         (22 == self.idNumber or 4 == self.getTickerEncode_MemSize())
+
+            spillFile.seek(0)
+            with open(bFileName, 'wb') as bFile:
+                blockWriter = BlockWriter(self,  bFile)
+                for spillRows, minSendTime, maxSendTime, blockData in self.iterSpilledBlocks(spillFile):
+                    if copyBlocks:
+                        blockWriter.copyBlock(spillRows,  minSendTime,  maxSendTime,  blockData)
+
+                    #grouped blocks are grouped by the ticker numbers, re-encode the whole block
+                    elif 22 == self.idNumber and not ord(blockData[0]) & 4:
+                        blockWriter.copyBlock(spillRows,  minSendTime,  maxSendTime,
+                                              self.remapTickerColumn(blockData,  spillRows,  tickerRemap))
+                    else:
+                        records = self.decodeBlock(blockData,  spillRows,  4)
+                        for x, record in enumerate(records):
+                            records[x] = record[:1] + (tickerRemap[record[1]],) + record[2:]
+                        blockWriter.copyBlock(spillRows,  minSendTime,  maxSendTime,
+                                              self.encodeBlock(records,  blockWriter.tickerEncode_MemSize))
+                        records = None
+                    self.reportProgress(blockWriter.rowCount)
+                blockWriter.close()
+
+        #printout peak memory, the process' resident size includes the interpreter
+        if resource is not None:
+            self.output.write('peak memory: {0} KB\n'.format(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
 
         #message
-        sys.stdout.write('compression complete\n')
+        self.output.write('compression complete\n')
 
     def decompress(self, bFileName, oFileName):
         '''
@@ -615,90 +2059,697 @@ class Compressor(object):
             oFileName (string): BAT file to be decompressed
 
         Attributes:
-            condFlags (int): condition flags for line byte memory size, combination 
-                             of timDiff_Flags, size_Flags and price precision
+            None
 
-            tickerDict_Length (int): the number of tickers from the compressed file
-            tickerDecode_MemSize (int): encoded ticker's byte memory size to be decoded
-            tickerValue (string): decoded ticker from compressed file's ticker dictionary
-            tickerSize (int): decoded ticker's string length from compressed file's ticker dictionary
+        Return:
+            None
+        '''
+        #message
+        self.output.write('begin decompression...\n')
 
-            decodeIndex (int): encoded ticker value to be decoded by ticker dictionary
+        #read compressed file 1st time to get decode header information
+        with open(bFileName, 'rb') as bFile:
+            self.decompressFile(bFile,  oFileName)
 
-            sendTime (int): decoded sendtime
-            receiveTime (int): decoded receivetime
-            timeDiff (int): decoded time difference
-            
-            precisionFormat (string): output format for decoded price precision
+        #message
+        self.output.write('decompression complete\n')
+
+    def export(self, bFileName, oFileName):
+        '''
+        Export compressed file into typed NumPy columns, one column per field.
+        Tickers are exported as their encoded values along with the Ticker Dictionary.
+        Prices are rounded to their price precision, matching the BAT file's values.
+        An output name ending in .npz is written as an uncompressed .npz archive,
+        otherwise a directory of memory-mappable .npy files is created.
+
+        Parameters:
+            bFileName (string): compressed file
+            oFileName (string): .npz archive or .npy directory to be exported
+
+        Attributes:
+            columns (List:Tuple(string,string,string)): column name, NumPy type descriptor
+                                                        and struct format of each column
+            columnDir (string): directory holding the .npy column files
+            columnBuffers (List:List): column values waiting to be written
+            exportBlockSize (int): number of records buffered before writing the columns
 
         Return:
             None
         '''
         #message
-        sys.stdout.write('begin decompression...\n')
+        self.output.write('begin export...\n')
 
-        #setup condition flags
-        condFlags = None
+        #number of records buffered before writing the columns
+        exportBlockSize = 65536
 
-        #read compressed file 1st time to get decode header information
         with open(bFileName, 'rb') as bFile:
+
+            #decode header
+            tickerDecode_MemSize = self.decodeHeader(bFile)
+
+            #.npz archive is built from .npy files in a temporary directory
+            if oFileName[-4:] == '.npz':
+                columnDir = tempfile.mkdtemp()
+            else:
+                columnDir = oFileName
+                if not os.path.isdir(columnDir):
+                    os.makedirs(columnDir)
+
+            #encoded tickers use the same byte memory size as the compressed file
+            tickerFormat = {1:'B', 2:'H', 4:'I'}[tickerDecode_MemSize]
+            columns = [('ticker', '<u{0}'.format(tickerDecode_MemSize), tickerFormat),
+                       ('exchange', '|S1', 'c'),
+                       ('side', '|S1', 'c'),
+                       ('condition', '|S1', 'c'),
+                       ('sendtime', '<i4', 'i'),
+                       ('recvtime', '<i8', 'q'),
+                       ('price', '<f8', 'd'),
+                       ('precision', '|u1', 'B'),
+                       ('size', '<u4', 'I')]
+
+            #message
+            self.output.write('exporting records...\n')
+
+            columnFiles = []
+            try:
+                #open column files and write their headers
+                for name, dtype, format in columns:
+                    cFile = open(os.path.join(columnDir, name + '.npy'), 'wb')
+                    columnFiles.append(cFile)
+                    self.writeNpyHeader(cFile, dtype, self.rowCount)
+
+                columnBuffers = [[] for column in columns]
+                for x, record in enumerate(self.iterRecords(bFile,  tickerDecode_MemSize)):
+                    condFlags, decodeIndex, exchange, side, condition, sendTime, timeDiff, price, size = record
+
+                    #round float price to its price precision
+                    if condFlags & 7:
+                        price = round(price, condFlags & 7)
+
+                    #buffer the record's values by column
+                    for index, value in enumerate((decodeIndex, exchange, side, condition, sendTime,
+                                                   sendTime + timeDiff, price, condFlags & 7, size)):
+                        columnBuffers[index].append(value)
+
+                    #write the buffered columns
+                    if exportBlockSize == len(columnBuffers[0]) or x == self.rowCount - 1:
+                        for index, (name, dtype, format) in enumerate(columns):
+                            columnFiles[index].write(
+                              struct.pack('<{0}{1}'.format(len(columnBuffers[index]), format), *columnBuffers[index]))
+                            columnBuffers[index] = []
+            finally:
+                for cFile in columnFiles:
+                    cFile.close()
+
+            #write ticker dictionary as fixed width strings
+            tickerWidth = max([1] + [len(ticker) for ticker in self.tickerDict])
+            with open(os.path.join(columnDir, 'tickers.npy'), 'wb') as cFile:
+                self.writeNpyHeader(cFile, '|S{0}'.format(tickerWidth), len(self.tickerDict))
+                for ticker in self.tickerDict:
+                    cFile.write(ticker.ljust(tickerWidth, '\0'))
+
+        #pack column files without compression so members can be mapped by offset
+        if oFileName[-4:] == '.npz':
+            with zipfile.ZipFile(oFileName, 'w', zipfile.ZIP_STORED, True) as zFile:
+                for name in [column[0] for column in columns] + ['tickers']:
+                    zFile.write(os.path.join(columnDir, name + '.npy'), name + '.npy')
+            shutil.rmtree(columnDir)
+
+        #message
+        self.output.write('export complete\n')
+
+    def extract(self, aFileName, outputDir, memberNames=None, workers=None):
+        '''
+        Extract archive members into BAT files in parallel. Each member is decompressed
+        from its manifest position without reading the other members.
+
+        Parameters:
+            aFileName (string): archive
+            outputDir (string): directory for the extracted BAT files
+            memberNames (List:string): members to be extracted, all if None
+            workers (int): number of worker processes, one per cpu if None
+
+        Attributes:
+            manifest (List:Tuple(string,int,int,int,int,int)): member's name, file position,
+                                                               byte size, row count, minimum
+                                                               and maximum sendtime
+
+        Return:
+            None
+        '''
+        #message
+        self.output.write('begin extract...\n')
+
+        with open(aFileName, 'rb') as aFile:
+            manifest = self.decodeManifest(aFile)
+
+        #select members to be extracted
+        if memberNames is not None:
+            archived = set([entry[0] for entry in manifest])
+            for memberName in memberNames:
+                if memberName not in archived:
+                    raise CompressorError('Member \'{0}\' not in archive'.format(memberName))
+            manifest = [entry for entry in manifest if entry[0] in memberNames]
+
+        if not os.path.isdir(outputDir):
+            os.makedirs(outputDir)
+
+        tasks = [(aFileName, entry[1], entry[2], os.path.join(outputDir, entry[0])) for entry in manifest]
+        pool = multiprocessing.Pool(workers)
+        try:
+            #workers' messages in member order
+            for messages in pool.imap(extractMember, tasks):
+                self.output.write(messages)
+            pool.close()
+        finally:
+            pool.terminate()
+
+        #message
+        self.output.write('extract complete, {0} members\n'.format(len(manifest)))
+
+    def info(self, bFileNames):
+        '''
+        Print the information of many compressed files from their headers and file
+        statistics, followed by totals across the files. Files that cannot be read
+        are reported and skipped.
+
+        Parameters:
+            bFileNames (List:string): compressed files or glob patterns
+
+        Attributes:
+            fileInfo (Dict): see getInfo()
+            tickerTotals (Dict): row count per ticker across the files
+            readCount (int): number of files read
+
+        Return:
+            None
+        '''
+        tickerTotals = {}
+        rowTotal = 0
+        readCount = 0
+        minSendTime = maxSendTime = None
+
+        for pattern in bFileNames:
+            for bFileName in sorted(glob.glob(pattern)) or [pattern]:
+                try:
+                    fileInfo = self.getInfo(bFileName)
+                except (CompressorError, IOError, struct.error) as error:
+                    self.output.write('{0}: {1}\n'.format(bFileName, error))
+                    continue
+
+                readCount += 1
+                rowTotal += fileInfo['rowCount']
+
+                self.output.write('{0}: file identifier {1}, {2} rows, {3} bytes\n'.format(
+                  bFileName, fileInfo['idNumber'], fileInfo['rowCount'], fileInfo['fileBytes']))
+                if fileInfo['blockCount'] is not None:
+                    self.output.write('  blocks: {0} of up to {1} rows\n'.format(fileInfo['blockCount'], fileInfo['blockSize']))
+                if 0 == fileInfo['rowCount']:
+                    self.output.write('  sendtime: empty, no records\n')
+                elif fileInfo['minSendTime'] is not None:
+                    self.output.write('  sendtime: {0} to {1}\n'.format(fileInfo['minSendTime'], fileInfo['maxSendTime']))
+                    if minSendTime is None or fileInfo['minSendTime'] < minSendTime:
+                        minSendTime = fileInfo['minSendTime']
+                    if maxSendTime is None or fileInfo['maxSendTime'] > maxSendTime:
+                        maxSendTime = fileInfo['maxSendTime']
+
+                #files without statistics only list their Ticker Dictionary
+                if fileInfo['tickerCounts'] is None:
+                    self.output.write('  tickers: {0} in dictionary, no file statistics\n'.format(len(fileInfo['tickerDict'])))
+                    for ticker in fileInfo['tickerDict']:
+                        tickerTotals.setdefault(ticker, 0)
+                    continue
+
+                tickerCounts = [(ticker, fileInfo['tickerCounts'][ticker]) for ticker in fileInfo['tickerDict']
+                                if fileInfo['tickerCounts'][ticker]]
+                self.output.write('  tickers: {0}\n'.format(len(tickerCounts)))
+                if tickerCounts:
+                    self.output.write('  rows per ticker: {0}\n'.format(
+                      ', '.join(['{0} {1}'.format(ticker, count) for ticker, count in tickerCounts])))
+                for ticker, count in tickerCounts:
+                    tickerTotals[ticker] = tickerTotals.get(ticker, 0) + count
+
+                fieldBytes = fileInfo['fieldBytes']
+                self.output.write('  bytes: header {0}, {1}, statistics, checksums and footer {2}\n'.format(
+                  fileInfo['headerBytes'],
+                  ', '.join(['{0} {1}'.format(field, fieldBytes[field]) for field in fileInfo['fieldNames']]),
+                  fileInfo['fileBytes'] - fileInfo['headerBytes'] - sum(fieldBytes.values())))
+
+        #totals across the files
+        if readCount > 1:
+            self.output.write('total: {0} files, {1} rows, {2} tickers'.format(readCount, rowTotal, len(tickerTotals)))
+            if minSendTime is not None:
+                self.output.write(', sendtime {0} to {1}'.format(minSendTime, maxSendTime))
+            self.output.write('\n')
+
+    def merge(self, bFileNames, oFileName):
+        '''
+        Merge compressed files into one compressed file ordered by sendtime.
+        Records are streamed from every input, the inputs' encoded tickers are
+        remapped into a unified Ticker Dictionary and no CSV text is rendered.
+        NOTE: each input is expected to be in sendtime order.
+
+        Parameters:
+            bFileNames (List:string): compressed files to be merged
+            oFileName (string): merged compressed file
+
+        Attributes:
+            inputs (List:Compressor): decoders holding each input's header information
+            tickerDecode_MemSizes (List:int): each input's encoded ticker byte memory size
+            tickerRemaps (List:List:int): each input's encoded ticker to unified encoded ticker
+            blockWriter (BlockWriter): encodes the merged records in blocks
+
+        Return:
+            None
+        '''
+        #message
+        self.output.write('begin merge...\n')
+
+        inputs = []
+        tickerDecode_MemSizes = []
+        bFiles = []
+        try:
+            #decode every input's header
+            for bFileName in bFileNames:
+                bFiles.append(open(bFileName, 'rb'))
+                inputs.append(Compressor())
+                inputs[-1].output = self.output
+                tickerDecode_MemSizes.append(inputs[-1].decodeHeader(bFiles[-1]))
+
+            #build unified ticker dictionary, the inputs' tickers are already unique strings
+            self.tickerDict = sorted(set([ticker for decoder in inputs for ticker in decoder.tickerDict]))
+            self.rowCount = sum([decoder.rowCount for decoder in inputs])
+
+            #map each input's encoded tickers to the unified ticker dictionary
+            tickerRemaps = []
+            for index, decoder in enumerate(inputs):
+                tickerRemaps.append([self.getEncodeTicker(self.tickerDict, ticker, 0, len(self.tickerDict)-1)
+                                     for ticker in decoder.tickerDict])
+                if -1 in tickerRemaps[-1]:
+                    raise CompressorError('Ticker {0} of merge input #{1} not in the unified ticker dictionary'.format(
+                      decoder.tickerDict[tickerRemaps[-1].index(-1)], index))
+
             with open(oFileName, 'wb') as oFile:
 
-                ###beginning of header decoding###
-                
-                #decode header
-                tickerDecode_MemSize = self.decodeHeader(bFile)
+                #encode header
+                blockWriter = BlockWriter(self,  oFile)
+
+                #message
+                self.output.write('merging records...\n')
+
+                #stream records from every input ordered by sendtime, ties keep input order
+                sources = [inputs[index].mergeSource(index, bFiles[index], tickerDecode_MemSizes[index])
+                           for index in range(len(inputs))]
+                for sendTime, index, x, record in heapq.merge(*sources):
+                    blockWriter.add(record[:1] + (tickerRemaps[index][record[1]],) + record[2:])
+
+                #encode last block and block index
+                blockWriter.close()
+        finally:
+            for bFile in bFiles:
+                bFile.close()
+
+        #message
+        self.output.write('merge complete\n')
+
+    def slice(self, bFileName, oFileName, startTime, stopTime):
+        '''
+        Slice the compressed file's records with sendtime in [startTime, stopTime)
+        into a compressed file. Blocks inside the time range are copied without
+        decoding, blocks outside are skipped and only boundary blocks are re-encoded.
+        NOTE: the Ticker Dictionary is kept so copied blocks' encoded tickers stay valid.
+
+        Parameters:
+            bFileName (string): compressed file
+            oFileName (string): sliced compressed file
+            startTime (int): first sendtime included
+            stopTime (int): first sendtime excluded
+
+        Attributes:
+            blockWriter (BlockWriter): writer for the sliced compressed file
+
+        Return:
+            None
+        '''
+        #message
+        self.output.write('begin slice...\n')
+
+        with open(bFileName, 'rb') as bFile:
+
+            #decode header
+            tickerDecode_MemSize = self.decodeHeader(bFile)
+
+            blockWriter = self.openBlockWriter(oFileName,  self.tickerDict)
+            try:
+                def blockRoute(minSendTime, maxSendTime):
+                    if maxSendTime < startTime or minSendTime >= stopTime:
+                        return ('skip', None)
+                    elif minSendTime >= startTime and maxSendTime < stopTime:
+                        return ('copy', blockWriter)
+                    return ('decode', None)
 
-                ###beginning of record decoding###
+                def recordRoute(record):
+                    if startTime <= record[5] < stopTime:
+                        return (blockWriter, record)
 
                 #message
-                sys.stdout.write('decoding records...\n')
-                #iterate through compressed file
-                for x in range(self.rowCount):
-                    #setup condition flags
-                    condFlags = 0
-                    #decode condition flags (1 byte, char)
-                    condFlags = ord(struct.unpack('c',bFile.read(1))[0])
-
-                    #decode ticker using its byte memory size
-                    if 1 == tickerDecode_MemSize:
-                        #(1 byte, unsigned char)
-                        decodeIndex = struct.unpack('B',bFile.read(1))[0]
-                    elif 2 == tickerDecode_MemSize:
-                        #(2 bytes, unsigned short)
-                        decodeIndex = struct.unpack('H',bFile.read(2))[0]
-                    elif 4 == tickerDecode_MemSize:
-                        #(4 bytes, unsigned int)
-                        decodeIndex = struct.unpack('I',bFile.read(4))[0]
-
-                    #write decoded ticker
-                    oFile.write(self.tickerDict[decodeIndex] + ',')
-
-                    #decode exchange, side and condition (1 byte each, char)
-                    for y in range(3):
-                        oFile.write(struct.unpack('c',bFile.read(1))[0]+',')
-
-                    #read sendtime (4 bytes, unsigned int)
-                    sendTime = struct.unpack('i',bFile.read(4))[0]
-
-                    #read time difference
-                    timeDiff = self.decodeTimeDiff(bFile,  condFlags)
-
-                    #get receive time
-                    receiveTime = sendTime + timeDiff
-                    #write sendtime and receiveTime
-                    oFile.write(str(sendTime) + ',' + str(receiveTime) + ',')
-
-                    #decode price
-                    self.decodePrice(bFile,  oFile,  condFlags)
-                    #decode size
-                    self.decodeSize(bFile,  oFile,  condFlags)
-                    
-                    #write Microsoft newline
-                    oFile.write('\r\n')
+                self.output.write('slicing records...\n')
+                self.routeBlocks(bFile,  tickerDecode_MemSize,  blockRoute,  recordRoute)
+
+                blockWriter.close()
+            finally:
+                blockWriter.bFile.close()
+
+        #message
+        self.output.write('slice complete, {0} records\n'.format(blockWriter.rowCount))
+
+    def split(self, bFileName, outputDir, splitKey, keys=None):
+        '''
+        Split the compressed file into one compressed file per ticker or per hour of
+        sendtime (milliseconds), named by ticker or two digit hour in outputDir.
+        Per ticker files are re-encoded with a Ticker Dictionary pruned to their ticker
+        in a single pass: each ticker's blocks are spilled to a temporary file, within
+        the memory budget, then copied into its file. Per hour files keep the Ticker
+        Dictionary so blocks within an hour are copied without decoding.
+
+        Parameters:
+            bFileName (string): compressed file
+            outputDir (string): directory for the split compressed files
+            splitKey (string): 'ticker' or 'hour'
+            keys (List:string): tickers or hours to be split out, all if None
+
+        Attributes:
+            encoder (Compressor): encodes the per ticker blocks, shared by all tickers
+            maxBufferedRows (int): records held in memory before every ticker's records are spilled
+            pending (Dict): encoded ticker to its records not yet spilled
+            spilled (Dict): encoded ticker to its spilled blocks' row count, minimum and
+                            maximum sendtime, file position and byte size
+            blockWriters (Dict): split key to writer for the split compressed file
+            hourTime (int): milliseconds in an hour
+
+        Return:
+            None
+        '''
+        #message
+        self.output.write('begin split...\n')
+
+        #estimated byte size of a record held in memory
+        recordBytes = 600
+        hourTime = 3600000
+
+        #split files keep the input's extension
+        extension = os.path.splitext(bFileName)[1]
+        if not os.path.isdir(outputDir):
+            os.makedirs(outputDir)
+
+        with open(bFileName, 'rb') as bFile:
+
+            #decode header
+            tickerDecode_MemSize = self.decodeHeader(bFile)
+
+            #message
+            self.output.write('splitting records...\n')
+
+            if 'ticker' == splitKey:
+                #get encoded tickers to be split out
+                tickerValues = range(len(self.tickerDict))
+                if keys is not None:
+                    tickerValues = []
+                    for ticker in keys:
+                        encodeTickerValue = self.getEncodeTicker(self.tickerDict, ticker, 0, len(self.tickerDict)-1)
+                        if -1 == encodeTickerValue:
+                            self.output.write('Warning: ticker {0} not in ticker dictionary\n'.format(ticker))
+                        else:
+                            tickerValues.append(encodeTickerValue)
+
+                #per ticker files share their block layout, only their Ticker Dictionary differs
+                encoder = Compressor()
+                encoder.output = self.output
+                encoder.tickerDict = ['']
+                encoder.blockSize = self.blockSize
+                if 19 != self.idNumber:
+                    encoder.idNumber = self.idNumber
+                tickerEncode_MemSize = encoder.getTickerEncode_MemSize()
+                maxBufferedRows = max(self.blockSize, self.memoryBudget // recordBytes)
+
+                pending = dict([(encodeTickerValue, []) for encodeTickerValue in tickerValues])
+                spilled = dict([(encodeTickerValue, []) for encodeTickerValue in tickerValues])
+
+                def spillBlock(encodeTickerValue):
+                    records = pending[encodeTickerValue]
+                    sendTimes = [record[5] for record in records]
+                    blockData = encoder.encodeBlock(records,  tickerEncode_MemSize)
+                    spilled[encodeTickerValue].append(
+                      (len(records), min(sendTimes), max(sendTimes), spillFile.tell(), len(blockData)))
+                    spillFile.write(blockData)
+                    pending[encodeTickerValue] = []
+
+                with tempfile.TemporaryFile() as spillFile:
+                    #route every record in one pass, full blocks are spilled as they fill
+                    bufferedRows = 0
+                    for record in self.iterRecords(bFile,  tickerDecode_MemSize):
+                        if record[1] not in pending:
+                            continue
+
+                        #single ticker dictionary, encoded ticker is always zero
+                        pending[record[1]].append(record[:1] + (0,) + record[2:])
+                        bufferedRows += 1
+                        if len(pending[record[1]]) == self.blockSize:
+                            spillBlock(record[1])
+                            bufferedRows -= self.blockSize
+
+                        #spill short blocks when too many tickers hold records
+                        if bufferedRows >= maxBufferedRows:
+                            for encodeTickerValue in pending:
+                                if pending[encodeTickerValue]:
+                                    spillBlock(encodeTickerValue)
+                            bufferedRows = 0
+
+                    for encodeTickerValue in pending:
+                        if pending[encodeTickerValue]:
+                            spillBlock(encodeTickerValue)
+
+                    #copy each ticker's spilled blocks into its file
+                    for encodeTickerValue in tickerValues:
+                        ticker = self.tickerDict[encodeTickerValue]
+                        blockWriter = self.openBlockWriter(os.path.join(outputDir, ticker + extension),  [ticker])
+                        try:
+                            for blockRows, minSendTime, maxSendTime, spillOffset, blockByteSize in spilled[encodeTickerValue]:
+                                spillFile.seek(spillOffset)
+                                blockWriter.copyBlock(blockRows,  minSendTime,  maxSendTime,  spillFile.read(blockByteSize))
+                            blockWriter.close()
+                        finally:
+                            blockWriter.bFile.close()
+
+            elif 'hour' == splitKey:
+                hours = None
+                if keys is not None:
+                    hours = set([int(hour) for hour in keys])
+                blockWriters = {}
+
+                def getBlockWriter(hour):
+                    if hour not in blockWriters:
+                        blockWriters[hour] = self.openBlockWriter(
+                          os.path.join(outputDir, '{0:02d}{1}'.format(hour, extension)),  self.tickerDict)
+                    return blockWriters[hour]
+
+                def blockRoute(minSendTime, maxSendTime):
+                    blockHours = range(minSendTime // hourTime, maxSendTime // hourTime + 1)
+                    if hours is not None and not hours.intersection(blockHours):
+                        return ('skip', None)
+                    elif 1 == len(blockHours):
+                        return ('copy', getBlockWriter(blockHours[0]))
+                    return ('decode', None)
+
+                def recordRoute(record):
+                    hour = record[5] // hourTime
+                    if hours is None or hour in hours:
+                        return (getBlockWriter(hour), record)
+
+                try:
+                    self.routeBlocks(bFile,  tickerDecode_MemSize,  blockRoute,  recordRoute)
+
+                    for blockWriter in blockWriters.values():
+                        blockWriter.close()
+                finally:
+                    for blockWriter in blockWriters.values():
+                        blockWriter.bFile.close()
+
+        #message
+        self.output.write('split complete\n')
+
+    def transcode(self, bFileName, oFileName, workers=None):
+        '''
+        Transcode a compressed file of any file identifier into this compressor's file
+        identifier, block size and column encoding settings without rendering any text.
+        Ranges of output blocks are decoded from the input blocks and encoded again in
+        parallel by a pool of worker processes, then written in order. A damaged input
+        block raises CompressorError, see readBlock().
+
+        Parameters:
+            bFileName (string): compressed file
+            oFileName (string): transcoded compressed file
+            workers (int): number of worker processes, one per cpu if None
+
+        Attributes:
+            decoder (Compressor): decodes the input file's header and block index
+            blockSpans (List:Tuple(int,int,int)): file position, row count and byte size of each
+                                                  input block, see decodeBlockSpans()
+            checksums (List:int): CRC32 of each input block's records, None for each block if
+                                  the file has no checksums
+            rowStarts (List:int): row index of each input block's first record, ascending
+            rangeRows (int): number of records encoded by one worker call
+            firstBlock (int): first input block holding records of the range
+            stopBlock (int): input block after the last one holding records of the range
+            tasks (List:Tuple): input blocks and record range encoded by one worker call
+            blockWriter (BlockWriter): encodes the header, records in blocks and block index
+
+        Return:
+            None
+        '''
+        if self.idNumber not in (20, 22):
+            raise CompressorError('Transcoded files must have file identifier 20 or 22')
+
+        #message
+        self.output.write('begin transcode...\n')
+
+        #index the input blocks, files without blocks are indexed by a scan
+        decoder = Compressor()
+        decoder.output = self.output
+        with open(bFileName, 'rb') as bFile:
+            tickerDecode_MemSize = decoder.decodeHeader(bFile)
+            if 19 != decoder.idNumber:
+                blockIndex = decoder.decodeBlockIndex(bFile)
+                blockSpans = decoder.decodeBlockSpans(bFile)
+                checksums = decoder.decodeChecksums(bFile) or [None] * len(blockIndex)
+            else:
+                blockIndex, recordSpans = decoder.indexRecords(bFile,  tickerDecode_MemSize)
+                blockSpans = [(recordSpans[x][0], blockIndex[x][1], recordSpans[x][1]) for x in range(len(blockIndex))]
+                checksums = [None] * len(blockIndex)
+
+        self.tickerDict = decoder.tickerDict
+        self.rowCount = decoder.rowCount
+        tickerEncode_MemSize = self.getTickerEncode_MemSize()
+        settings = (self.idNumber, self.blockSize, self.repeatFields, self.groupTickers)
+
+        rowStarts = []
+        rowStart = 0
+        for entry in blockIndex:
+            rowStarts.append(rowStart)
+            rowStart += entry[1]
+
+        #each worker call encodes a whole number of output blocks
+        rangeRows = 16 * self.blockSize
+        tasks = []
+        for rangeStart in range(0, self.rowCount, rangeRows):
+            rangeStop = min(rangeStart + rangeRows, self.rowCount)
+            firstBlock = bisect.bisect_right(rowStarts, rangeStart) - 1
+            stopBlock = bisect.bisect_left(rowStarts, rangeStop)
+            blocks = [(x, blockSpans[x], checksums[x], rowStarts[x]) for x in range(firstBlock, stopBlock)]
+            tasks.append((bFileName, decoder.idNumber, tickerDecode_MemSize, blocks,
+                          rangeStart, rangeStop, settings, tickerEncode_MemSize))
+
+        pool = multiprocessing.Pool(workers)
+        try:
+            with open(oFileName, 'wb') as oFile:
+                blockWriter = BlockWriter(self,  oFile)
+
+                #message
+                self.output.write('transcoding blocks...\n')
+
+                for encodedBlocks in pool.imap(transcodeBlocks, tasks):
+                    for blockRows, minSendTime, maxSendTime, blockData in encodedBlocks:
+                        blockWriter.writeBlock(blockRows,  minSendTime,  maxSendTime,  blockData)
+                    self.reportProgress(blockWriter.rowCount)
+                blockWriter.close()
+
+            pool.close()
+        finally:
+            pool.terminate()
 
         #message
-        sys.stdout.write('decompression complete\n')
+        self.output.write('transcode complete, file identifier {0} to {1}\n'.format(decoder.idNumber, self.idNumber))
+
+    def verify(self, bFileNames, workers=None):
+        '''
+        Verify compressed files' blocks in parallel without rendering any output. Each
+        block's header must match the block index and its records must match the block's
+        checksum; blocks of files written without checksums must decode. Damaged blocks
+        are reported by their position in the block index, files that cannot be read
+        are reported as unreadable.
+
+        Parameters:
+            bFileNames (List:string): compressed files or glob patterns
+            workers (int): number of worker processes, one per cpu if None
+
+        Attributes:
+            tasks (List:Tuple): file and block spans verified by one worker call
+            blockCounts (Dict): number of blocks of each file to be verified
+            damaged (Dict): damaged block numbers of each file
+            unreadable (List:string): files whose header, block index or footer cannot be read
+
+        Return:
+            damaged (Dict): damaged block numbers of each file, None if the file cannot be read
+        '''
+        #message
+        self.output.write('begin verify...\n')
+
+        tasks = []
+        blockCounts = {}
+        hasChecksums = {}
+        unreadable = []
+        for pattern in bFileNames:
+            for bFileName in sorted(glob.glob(pattern)) or [pattern]:
+                try:
+                    with open(bFileName, 'rb') as bFile:
+                        decoder = Compressor()
+                        decoder.messages = False
+                        decoder.decodeHeader(bFile)
+                        if 19 == decoder.idNumber:
+                            self.output.write('{0}: records only file has no blocks to verify\n'.format(bFileName))
+                            continue
+                        blockSpans = decoder.decodeBlockSpans(bFile)
+                        checksums = decoder.decodeChecksums(bFile)
+                except (CompressorError, IOError, struct.error, ValueError) as error:
+                    self.output.write('{0}: {1}\n'.format(bFileName, error))
+                    unreadable.append(bFileName)
+                    continue
+
+                #each block's position, row count, byte size and checksum
+                blocks = [(x,) + blockSpans[x] + (checksums[x] if checksums is not None else None,)
+                          for x in range(len(blockSpans))]
+
+                blockCounts[bFileName] = len(blocks)
+                hasChecksums[bFileName] = checksums is not None
+                for x in range(0, len(blocks), 64):
+                    tasks.append((bFileName, blocks[x:x + 64]))
+
+        damaged = dict([(bFileName, []) for bFileName in blockCounts])
+        pool = multiprocessing.Pool(workers)
+        try:
+            for bFileName, damagedBlocks in pool.imap_unordered(verifyBlocks, tasks):
+                damaged[bFileName].extend(damagedBlocks)
+            pool.close()
+        finally:
+            pool.terminate()
+
+        for bFileName in sorted(damaged):
+            damaged[bFileName].sort()
+            checked = 'checksums' if hasChecksums[bFileName] else 'decoded, no checksums'
+            if damaged[bFileName]:
+                self.output.write('{0}: {1} of {2} blocks damaged ({3}): {4}\n'.format(
+                  bFileName, len(damaged[bFileName]), blockCounts[bFileName], checked,
+                  ', '.join([str(blockNumber) for blockNumber in damaged[bFileName]])))
+            else:
+                self.output.write('{0}: {1} blocks verified ({2})\n'.format(bFileName, blockCounts[bFileName], checked))
+
+        for bFileName in unreadable:
+            damaged[bFileName] = None
+
+        #message
+        self.output.write('verify complete\n')
+
+        return damaged
 
     def run(self, argv):
         '''
@@ -708,49 +2759,524 @@ class Compressor(object):
             argv (List): passed argument list
 
         Attributes:
+            inputFiles (List:string): input paths and filenames
             inputFile (string): input path and filename
             outputFile (string): output path and filename
             flagOption (string): command line flag options
 
         Return:
-            None
+            status (int): exit status, 1 if verify found damaged blocks or unreadable files, otherwise 0
         '''
 
         #check argument list
-        if 3 != len(argv):
-            sys.stdout.write(
-              'Need to enter the following argument list: [-c|-d] <inputfile> <outputfile>\n')
-            sys.exit()
+        argCounts = {'-a':(3,), '-c':(3,), '-cp':(3,), '-cg':(3,), '-cr':(3,), '-cs':(3,4), '-d':(3,4), '-dg':(3,4), '-dp':(3,4), '-e':(3,), '-s':(4,5), '-r':(4,5), '-t':(5,), '-x':(3,4)}
+        if len(argv) < (2 if argv[:1] in (['-i'], ['-v']) else 3) or (argv[0] in argCounts and len(argv) not in argCounts[argv[0]]):
+            raise CompressorError(
+              'Need to enter the following argument list: [-c|-cp|-cg|-cr|-e] <inputfile> <outputfile>\n'
+              '                                       or: [-d|-dp|-dg] <inputfile> <outputfile> [skipdamaged]\n'
+              '                                       or: -cs <inputfile|-> <outputfile> [<memorybudgetMB>]\n'
+              '                                       or: [-i|-v] <inputfile|pattern> ...\n'
+              '                                       or: -m <inputfile> <inputfile> ... <outputfile>\n'
+              '                                       or: -r <inputfile> <outputfile> 20|22 [repeat|grouped]\n'
+              '                                       or: -s <inputfile> <outputdir> ticker|hour [<key>,...]\n'
+              '                                       or: -t <inputfile> <outputfile> <starttime> <stoptime>\n'
+              '                                       or: -a <inputdir|pattern> <archivefile>\n'
+              '                                       or: -x <archivefile> <outputdir> [<member>,...]')
 
         #assign argument list
-        inputFile = argv[1]
-        outputFile = argv[2]
         flagOption = argv[0]
+        if '-m' == flagOption:
+            inputFiles = argv[1:-1]
+            outputFile = argv[-1]
+        elif flagOption in ('-i', '-v'):
+            inputFiles = argv[1:]
+            outputFile = None
+        else:
+            inputFiles = argv[1:2]
+            outputFile = argv[2]
+        inputFile = inputFiles[0]
 
         #check input/output file path
-        if not os.path.exists(r'{0}'.format(inputFile)):
-            sys.stdout.write('Input file \'{0}\' does not exist\n'.format(inputFile))
-            sys.exit()
+        #NOTE: archive, info and verify input may be glob patterns, checked by archive(), info() and verify()
+        #  single pass compression reads standard input for -
+        for inputFile in inputFiles:
+            if flagOption not in ('-a', '-i', '-v') and not ('-cs' == flagOption and '-' == inputFile) and not os.path.exists(r'{0}'.format(inputFile)):
+                raise CompressorError('Input file \'{0}\' does not exist'.format(inputFile))
 
         #check flag options        
-        if '-c' != flagOption and '-d' != flagOption:
-            sys.stdout.write('Flag option should be -c (compress) or -d (decompress)\n')
-            sys.exit()
+        if flagOption not in ('-a', '-c', '-cp', '-cg', '-cr', '-cs', '-d', '-dp', '-dg', '-e', '-i', '-m', '-r', '-s', '-t', '-v', '-x'):
+            raise CompressorError(
+              'Flag option should be -c (compress), -d (decompress), -e (export), -i (info), -m (merge),\n'
+              '  -r (transcode), -s (split), -t (time slice), -v (verify), -a (archive) or -x (extract),\n'
+              '  -cp and -dp compress and decompress with pipelined reads and writes,\n'
+              '  -cr compresses with repeated fields flagged,\n'
+              '  -cg compresses with records grouped by ticker per block, -dg decompresses grouped,\n'
+              '  -cs compresses in a single pass within an estimated memory budget')
+
+        #check split key
+        if '-s' == flagOption and argv[3] not in ('ticker', 'hour'):
+            raise CompressorError('Split key should be ticker or hour')
+
+        #check transcode settings
+        if '-r' == flagOption and (argv[3] not in ('20', '22') or argv[4:] not in ([], ['repeat'], ['grouped'])):
+            raise CompressorError('Transcode file identifier should be 20 or 22, optionally followed by repeat or grouped')
+
+        #check decompression option
+        if flagOption in ('-d', '-dp', '-dg') and argv[3:] not in ([], ['skipdamaged']):
+            raise CompressorError('Decompression option should be skipdamaged')
+
+        #check time range
+        if '-t' == flagOption and not (argv[3].lstrip('-').isdigit() and argv[4].lstrip('-').isdigit()):
+            raise CompressorError('Start and stop time must be integers')
+
+        #check memory budget
+        if '-cs' == flagOption and 4 == len(argv) and not (argv[3].isdigit() and int(argv[3]) > 0):
+            raise CompressorError('Memory budget must be a positive number of megabytes')
 
         #check for csv file format
-        if '-c' == flagOption and inputFile[-4:] != '.csv':#not re.match('^\w+.csv$',inputFile):
-            sys.stdout.write('Input file must be in csv format for compression\n')
-            sys.exit()            
-
-        #run compress() or decompress()
+        if (flagOption in ('-c', '-cp', '-cg', '-cr') or ('-cs' == flagOption and '-' != inputFile)) and inputFile[-4:] != '.csv':#not re.match('^\w+.csv$',inputFile):
+            raise CompressorError('Input file must be in csv format for compression')
+
+        #pipelined reader, encoder and writer stages
+        if flagOption in ('-cp', '-dp'):
+            self.pipelineDepth = 4
+            flagOption = flagOption[:2]
+
+        #repeated fields flagged
+        if '-cr' == flagOption:
+            self.repeatFields = True
+            flagOption = '-c'
+
+        #records grouped by ticker
+        if '-cg' == flagOption:
+            self.groupTickers = True
+            flagOption = '-c'
+        elif '-dg' == flagOption:
+            self.groupedOutput = True
+            flagOption = '-d'
+
+        #run selected mode
         if '-c' == flagOption:   
             self.compress(inputFile, outputFile)
+        elif '-cs' == flagOption:
+            if 4 == len(argv):
+                self.memoryBudget = int(argv[3]) << 20
+            if '-' == inputFile:
+                self.compressStream(sys.stdin, outputFile)
+            else:
+                with open(inputFile,'rb') as iFile:
+                    self.compressStream(iFile, outputFile)
         elif '-d' == flagOption:
+            self.skipDamaged = argv[3:] == ['skipdamaged']
             self.decompress(inputFile, outputFile)
+        elif '-e' == flagOption:
+            self.export(inputFile, outputFile)
+        elif '-i' == flagOption:
+            self.info(inputFiles)
+        elif '-m' == flagOption:
+            self.merge(inputFiles, outputFile)
+        elif '-r' == flagOption:
+            self.idNumber = int(argv[3])
+            self.repeatFields = argv[4:] == ['repeat']
+            self.groupTickers = argv[4:] == ['grouped']
+            self.transcode(inputFile, outputFile)
+        elif '-s' == flagOption:
+            self.split(inputFile, outputFile, argv[3], argv[4].split(',') if 5 == len(argv) else None)
+        elif '-t' == flagOption:
+            self.slice(inputFile, outputFile, int(argv[3]), int(argv[4]))
+        elif '-v' == flagOption:
+            damaged = self.verify(inputFiles)
+            if any([damagedBlocks is None or damagedBlocks for damagedBlocks in damaged.values()]):
+                return 1
+        elif '-a' == flagOption:
+            self.archive(inputFile, outputFile)
+        elif '-x' == flagOption:
+            self.extract(inputFile, outputFile, argv[3].split(',') if 4 == len(argv) else None)
+
+        return 0
+
+
+class BlockWriter(object):
+
+    def __init__(self, compressor, bFile):
+        '''
+        Encodes the header, then records into blocks followed by the block index.
+        The header's number of lines is corrected on close if it differs from
+        the number of records added.
+
+        Parameters:
+            compressor (Compressor): holds the Ticker Dictionary, block size and record encoding
+            bFile (file): file object for compressed file
+
+        Attributes:
+            compressor (Compressor): holds the Ticker Dictionary, block size and record encoding
+            bFile (file): file object for compressed file
+            tickerEncode_MemSize (int): encoded ticker's byte memory size
+            blockIndex (List:Tuple(int,int,int,int)): block's file position, row count,
+                                                      minimum and maximum sendtime
+            blockRecords (List:Tuple): records of the block being built
+            minSendTime (int): minimum sendtime in the block being built
+            maxSendTime (int): maximum sendtime in the block being built
+            rowCount (int): number of records written
+            fieldBytes (List:int): byte size per field written, see scanBlock()
+            tickerCounts (List:int): number of records written per Ticker Dictionary ticker
+            checksums (List:int): CRC32 of each block's records
+
+        Return:
+            None
+        '''
+        self.compressor = compressor
+        self.bFile = bFile
+        self.tickerEncode_MemSize = compressor.getTickerEncode_MemSize()
+        self.blockIndex = []
+        self.blockRecords = []
+        self.minSendTime = None
+        self.maxSendTime = None
+        self.rowCount = 0
+        self.fieldBytes = [0] * 10
+        self.tickerCounts = [0] * len(compressor.tickerDict)
+        self.checksums = []
+
+        #grouped blocks do not flag repeated fields
+        if compressor.groupTickers and compressor.repeatFields:
+            raise CompressorError('Ticker grouping and repeated fields flagging cannot be combined')
+
+        #encode header
+        compressor.encodeHeader(bFile)
+
+    def add(self, record):
+        '''
+        Add a record to the block being built.
+
+        Parameters:
+            record (Tuple): (condFlags, encodeTickerValue, exchange, side, condition,
+                             sendTime, timeDiff, price, size)
+
+        Attributes:
+            None
+
+        Return:
+            None
+        '''
+        #track the block's sendtime range
+        if not self.blockRecords:
+            self.minSendTime = self.maxSendTime = record[5]
+        elif record[5] < self.minSendTime:
+            self.minSendTime = record[5]
+        elif record[5] > self.maxSendTime:
+            self.maxSendTime = record[5]
+        self.blockRecords.append(record)
+
+        #write full block
+        if len(self.blockRecords) == self.compressor.blockSize:
+            self.flush()
+
+    def close(self):
+        '''
+        Write the last block, the block index, the file statistics and the block
+        checksums, then correct the header's number of lines.
+
+        Parameters:
+            None
+
+        Attributes:
+            endOffset (int): file position after the block index
+            stats (Tuple): see encodeStats()
+
+        Return:
+            None
+        '''
+        self.flush()
+
+        #file sendtime range from the block index
+        minSendTime = min([entry[2] for entry in self.blockIndex] or [0])
+        maxSendTime = max([entry[3] for entry in self.blockIndex] or [0])
+
+        #block index, statistics, checksums (4 bytes each, unsigned int) and footer
+        self.fieldBytes[9] += struct.calcsize('QIii') * len(self.blockIndex)
+        stats = (minSendTime, maxSendTime, self.fieldBytes, self.tickerCounts)
+        self.compressor.encodeBlockIndex(self.bFile,  self.blockIndex,  self.compressor.encodeStats(stats) +
+                                         struct.pack('<{0}I'.format(len(self.checksums)), *self.checksums))
+
+        #correct number of lines (8 bytes, unsigned long) after the file identifier
+        if self.rowCount != self.compressor.rowCount:
+            self.compressor.rowCount = self.rowCount
+            endOffset = self.bFile.tell()
+            self.bFile.seek(2)
+            self.bFile.write(struct.pack('L',self.rowCount))
+            self.bFile.seek(endOffset)
+
+    def copyBlock(self, blockRows, minSendTime, maxSendTime, blockData):
+        '''
+        Write an already encoded block without decoding its records.
+        NOTE: the block's encoded tickers and block layout must match this file's.
+
+        Parameters:
+            blockRows (int): number of records in the block
+            minSendTime (int): minimum sendtime in the block
+            maxSendTime (int): maximum sendtime in the block
+            blockData (string): block's encoded records
+
+        Attributes:
+            None
+
+        Return:
+            None
+        '''
+        #keep record order, write the block being built first
+        self.flush()
+        self.writeBlock(blockRows,  minSendTime,  maxSendTime,  blockData)
+
+    def flush(self):
+        '''
+        Write the block being built.
+
+        Parameters:
+            None
+
+        Attributes:
+            None
+
+        Return:
+            None
+        '''
+        if self.blockRecords:
+            self.writeBlock(len(self.blockRecords),  self.minSendTime,  self.maxSendTime,
+                            self.compressor.encodeBlock(self.blockRecords,  self.tickerEncode_MemSize))
+            self.blockRecords = []
+
+    def writeBlock(self, blockRows, minSendTime, maxSendTime, blockData):
+        '''
+        Encode a block's header and records and add it to the block index.
+
+        Parameters:
+            blockRows (int): number of records in the block
+            minSendTime (int): minimum sendtime in the block
+            maxSendTime (int): maximum sendtime in the block
+            blockData (string): block's encoded records
+
+        Attributes:
+            None
+
+        Return:
+            None
+        '''
+        self.blockIndex.append((self.bFile.tell(), blockRows, minSendTime, maxSendTime))
+
+        #encode block row count and byte size (4 bytes each, unsigned int)
+        self.bFile.write(struct.pack('II',blockRows,len(blockData)))
+        self.bFile.write(blockData)
+        self.checksums.append(zlib.crc32(blockData) & 0xffffffff)
+
+        self.rowCount += blockRows
+
+        #add the block's byte size per field and records per ticker to the file statistics
+        fieldBytes, tickers = self.compressor.scanBlock(blockData,  blockRows,  self.tickerEncode_MemSize)
+        fieldBytes[9] += 8
+        for x in range(10):
+            self.fieldBytes[x] += fieldBytes[x]
+        for ticker in tickers:
+            self.tickerCounts[ticker] += 1
+
+
+class MemberFile(object):
+
+    def __init__(self, aFile, memberOffset, memberByteSize):
+        '''
+        File object limited to an archive member, positions are relative to the member.
+
+        Parameters:
+            aFile (file): file object for archive
+            memberOffset (int): file position of the member
+            memberByteSize (int): byte size of the member
+
+        Attributes:
+            aFile (file): file object for archive
+            memberOffset (int): file position of the member
+            memberByteSize (int): byte size of the member
+
+        Return:
+            None
+        '''
+        self.aFile = aFile
+        self.memberOffset = memberOffset
+        self.memberByteSize = memberByteSize
+        self.aFile.seek(memberOffset)
+
+    def read(self, size=-1):
+        '''
+        Read up to size bytes, without passing the end of the member.
+        '''
+        remaining = self.memberByteSize - self.tell()
+        if size < 0 or size > remaining:
+            size = remaining
+        return self.aFile.read(size)
+
+    def seek(self, offset, whence=0):
+        '''
+        Seek relative to the member's start (0), current position (1) or end (2).
+        '''
+        if 0 == whence:
+            self.aFile.seek(self.memberOffset + offset)
+        elif 1 == whence:
+            self.aFile.seek(offset, 1)
+        else:
+            self.aFile.seek(self.memberOffset + self.memberByteSize + offset)
+
+    def tell(self):
+        '''
+        Get the position relative to the member's start.
+        '''
+        return self.aFile.tell() - self.memberOffset
+
+
+def archiveMember(task):
+    '''
+    Compress a BAT file for an archive, run by archive()'s worker processes.
+
+    Parameters:
+        task (Tuple(string,string,Tuple)): BAT file, compressed file and the archiving
+                                           compressor's settings, see archive()
+
+    Return:
+        (member name, compressed file, row count, minimum and maximum sendtime, messages)
+    '''
+    iFileName, bFileName, settings = task
+    output = io.BytesIO()
+
+    member = Compressor()
+    member.output = output
+    tickerStructClass, member.idNumber, member.blockSize, member.repeatFields, member.groupTickers = settings
+    member.tickerStruct = tickerStructClass()
+    member.compress(iFileName, bFileName)
+
+    #get sendtime range from the block index
+    with open(bFileName, 'rb') as bFile:
+        member = Compressor()
+        member.output = output
+        member.decodeHeader(bFile)
+        blockIndex = member.decodeBlockIndex(bFile)
+
+    minSendTime = min([entry[2] for entry in blockIndex] or [0])
+    maxSendTime = max([entry[3] for entry in blockIndex] or [0])
+
+    return (os.path.basename(iFileName), bFileName, member.rowCount, minSendTime, maxSendTime, output.getvalue())
+
+
+def extractMember(task):
+    '''
+    Decompress an archive member into a BAT file, run by extract()'s worker processes.
+
+    Parameters:
+        task (Tuple(string,int,int,string)): archive, member's file position and byte size, BAT file
+
+    Return:
+        messages (string): the worker's messages
+    '''
+    aFileName, memberOffset, memberByteSize, oFileName = task
+    member = Compressor()
+    member.output = io.BytesIO()
+    with open(aFileName, 'rb') as aFile:
+        member.decompressFile(MemberFile(aFile, memberOffset, memberByteSize),  oFileName)
+
+    return member.output.getvalue()
+
+
+def transcodeBlocks(task):
+    '''
+    Decode a range of records from a compressed file's blocks and encode them into
+    output blocks, run by transcode()'s worker processes.
+
+    Parameters:
+        task (Tuple): compressed file, its file identifier and encoded ticker byte memory size,
+                      each input block's number, span (see decodeBlockSpans(), records only
+                      files' spans exclude the block header), checksum and first row index,
+                      record range, output file identifier, block size, repeated fields and
+                      grouped tickers settings, and output encoded ticker byte memory size
+
+    Return:
+        encodedBlocks (List:Tuple): each output block's row count, minimum and maximum sendtime
+                                    and encoded records
+    '''
+    bFileName, idNumber, tickerDecode_MemSize, blocks, rangeStart, rangeStop, settings, tickerEncode_MemSize = task
+
+    #only the block layout is needed to decode, the Ticker Dictionary is unchanged
+    decoder = Compressor()
+    decoder.idNumber = idNumber
+    encoder = Compressor()
+    encoder.idNumber, encoder.blockSize, encoder.repeatFields, encoder.groupTickers = settings
+
+    records = []
+    with open(bFileName, 'rb') as bFile:
+        for blockNumber, (blockOffset, blockRows, blockByteSize), checksum, rowStart in blocks:
+            #records only files have no block headers or checksums
+            if 19 == idNumber:
+                bFile.seek(blockOffset)
+                blockData = bFile.read(blockByteSize)
+            else:
+                blockData = decoder.readBlock(bFile,  blockNumber,  (blockOffset, blockRows, blockByteSize),  checksum)
+            blockRecords = decoder.decodeBlock(blockData,  blockRows,  tickerDecode_MemSize)
+            records.extend(blockRecords[max(rangeStart - rowStart, 0):rangeStop - rowStart])
+
+    encodedBlocks = []
+    for x in range(0, len(records), encoder.blockSize):
+        blockRecords = records[x:x + encoder.blockSize]
+        sendTimes = [record[5] for record in blockRecords]
+        encodedBlocks.append((len(blockRecords), min(sendTimes), max(sendTimes),
+                              encoder.encodeBlock(blockRecords,  tickerEncode_MemSize)))
+
+    return encodedBlocks
+
+
+def verifyBlocks(task):
+    '''
+    Verify a compressed file's blocks, run by verify()'s worker processes.
+
+    Parameters:
+        task (Tuple(string,List:Tuple)): compressed file and each block's number, file position,
+                                         row count, byte size and checksum (None if unknown)
+
+    Return:
+        (compressed file, damaged block numbers)
+    '''
+    bFileName, blocks = task
+    damagedBlocks = []
+
+    with open(bFileName, 'rb') as bFile:
+        decoder = Compressor()
+        decoder.messages = False
+        tickerDecode_MemSize = decoder.decodeHeader(bFile)
+
+        for blockNumber, blockOffset, blockRows, blockByteSize, checksum in blocks:
+            bFile.seek(blockOffset)
+            blockHeader = bFile.read(8)
+            blockData = bFile.read(blockByteSize)
+
+            #block header must match the block index
+            if len(blockHeader) != 8 or struct.unpack('II',blockHeader) != (blockRows, blockByteSize) or \
+               len(blockData) != blockByteSize:
+                damagedBlocks.append(blockNumber)
+
+            #records must match the checksum, or decode without one
+            elif checksum is not None:
+                if zlib.crc32(blockData) & 0xffffffff != checksum:
+                    damagedBlocks.append(blockNumber)
+            else:
+                try:
+                    decoder.decodeBlock(blockData,  blockRows,  tickerDecode_MemSize)
+                except Exception:
+                    damagedBlocks.append(blockNumber)
+
+    return bFileName, damagedBlocks
 
 
 def main(argv):
-    Compressor().run(argv)
+    try:
+        status = Compressor().run(argv)
+    except CompressorError as error:
+        sys.stdout.write('{0}\n'.format(error))
+        sys.exit(1)
+    sys.exit(status)
 
 if __name__ == '__main__':
         main(sys.argv[1:]) 
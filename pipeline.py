@@ -0,0 +1,184 @@
+'''
+BAT Compressor Pipeline
+Author: Derek Bredbenner
+'''
+
+import sys
+import threading
+import Queue
+
+
+class ChunkReader(object):
+
+    def __init__(self, chunks, maxChunks):
+        '''
+        Reads chunks on a reader thread ahead of the consumer. The bounded queue
+        caps the number of chunks held in memory.
+
+        Parameters:
+            chunks (iterable): produces the chunks, iterated on the reader thread
+            maxChunks (int): maximum number of chunks waiting in the queue
+
+        Attributes:
+            queue (Queue): chunks waiting for the consumer
+            stopEvent (Event): stops the reader thread when set
+            errorInfo (Tuple): exception info raised on the reader thread
+            thread (Thread): reader thread
+
+        Return:
+            None
+        '''
+        self.chunks = chunks
+        self.queue = Queue.Queue(maxChunks)
+        self.stopEvent = threading.Event()
+        self.errorInfo = None
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def __iter__(self):
+        '''
+        Iterate through the chunks, raising the reader thread's error.
+        '''
+        while True:
+            chunk = self.queue.get()
+            if chunk is None:
+                break
+            yield chunk
+
+        if self.errorInfo is not None:
+            raise self.errorInfo[0], self.errorInfo[1], self.errorInfo[2]
+
+    def close(self):
+        '''
+        Stop the reader thread, discarding chunks not consumed.
+
+        Parameters:
+            None
+
+        Attributes:
+            None
+
+        Return:
+            None
+        '''
+        self.stopEvent.set()
+        while self.thread.is_alive():
+            try:
+                self.queue.get(timeout=0.1)
+            except Queue.Empty:
+                pass
+
+    def run(self):
+        '''
+        Reader thread, queues the chunks followed by None.
+        '''
+        try:
+            for chunk in self.chunks:
+                if self.stopEvent.is_set():
+                    break
+                self.queue.put(chunk)
+        except Exception:
+            self.errorInfo = sys.exc_info()
+        finally:
+            self.queue.put(None)
+
+
+class QueuedWriter(object):
+
+    def __init__(self, oFile, maxChunks):
+        '''
+        File object writing on a writer thread so the caller is not blocked by
+        the disk. The bounded queue caps the number of writes held in memory.
+        NOTE: tell() is tracked without waiting, seek() waits for queued writes.
+
+        Parameters:
+            oFile (file): file object to be written
+            maxChunks (int): maximum number of writes waiting in the queue
+
+        Attributes:
+            oFile (file): file object to be written
+            queue (Queue): writes waiting for the writer thread
+            position (int): file position after the queued writes
+            errorInfo (Tuple): exception info raised on the writer thread
+            thread (Thread): writer thread
+
+        Return:
+            None
+        '''
+        self.oFile = oFile
+        self.queue = Queue.Queue(maxChunks)
+        self.position = oFile.tell()
+        self.errorInfo = None
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def checkError(self):
+        '''
+        Raise the writer thread's error.
+        '''
+        if self.errorInfo is not None:
+            errorInfo, self.errorInfo = self.errorInfo, None
+            raise errorInfo[0], errorInfo[1], errorInfo[2]
+
+    def close(self):
+        '''
+        Wait for the queued writes and stop the writer thread.
+        NOTE: does not close the file object.
+
+        Parameters:
+            None
+
+        Attributes:
+            None
+
+        Return:
+            None
+        '''
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        self.checkError()
+
+    def run(self):
+        '''
+        Writer thread, writes until None is queued. After an error the remaining
+        writes are discarded so the caller never blocks.
+        '''
+        while True:
+            data = self.queue.get()
+            if data is None:
+                break
+            if self.errorInfo is None:
+                try:
+                    self.oFile.write(data)
+                except Exception:
+                    self.errorInfo = sys.exc_info()
+
+    def seek(self, offset, whence=0):
+        '''
+        Wait for the queued writes, then seek the file object.
+        '''
+        self.close()
+        self.oFile.seek(offset, whence)
+        self.position = self.oFile.tell()
+
+        #restart the writer thread
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def tell(self):
+        '''
+        Get the file position after the queued writes.
+        '''
+        return self.position
+
+    def write(self, data):
+        '''
+        Queue data to be written.
+        '''
+        self.checkError()
+        self.queue.put(data)
+        self.position += len(data)
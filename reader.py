@@ -0,0 +1,313 @@
+'''
+BAT Compressor Reader
+Author: Derek Bredbenner
+'''
+
+import bisect
+import collections
+import struct
+import threading
+import zlib
+
+import compressor
+
+
+class Reader(object):
+
+    def __init__(self, bFileName, maxBlocks=64, skipDamaged=False):
+        '''
+        Random access to a compressed file's records. The header, Ticker Dictionary
+        and block index are decoded once, decoded blocks are kept in a LRU cache.
+        Blocks are checked against their checksums when the file has them, a damaged
+        block raises CompressorError or is skipped by scan() and select().
+        The Reader can be shared across threads.
+
+        Parameters:
+            bFileName (string): compressed file
+            maxBlocks (int): maximum number of decoded blocks kept in the cache
+            skipDamaged (Bool): scan() and select() skip damaged blocks instead of raising
+
+        Attributes:
+            decoder (Compressor): holds the header information and record decoding
+            bFile (file): file object for compressed file
+            tickerDecode_MemSize (int): encoded ticker's byte memory size to be decoded
+            tickerDict (List:string): used for decoding tickers
+            rowCount (int): number of records in the compressed file
+            blockIndex (List:Tuple(int,int,int,int)): block's file position, row count,
+                                                      minimum and maximum sendtime
+            blockSpans (List:Tuple(int,int)): file position and byte size of each block's records
+            rowStarts (List:int): row index of each block's first record
+            checksums (List:int): CRC32 of each block's records, None if the file has none
+            skipDamaged (Bool): scan() and select() skip damaged blocks instead of raising
+            damagedBlocks (Set:int): blocks found damaged
+            maxBlocks (int): maximum number of decoded blocks kept in the cache
+            blockCache (OrderedDict): block number to decoded rows, least recently used first
+            hits (int): number of block requests served by the cache
+            misses (int): number of block requests decoded from the file
+            lock (Lock): guards the file object, cache and counters
+
+        Return:
+            None
+        '''
+        self.decoder = compressor.Compressor()
+        self.decoder.messages = False
+        self.bFile = open(bFileName, 'rb')
+        self.tickerDecode_MemSize = self.decoder.decodeHeader(self.bFile)
+        self.tickerDict = self.decoder.tickerDict
+        self.rowCount = self.decoder.rowCount
+
+        #records in blocks use the block index, records only are indexed by a scan
+        self.checksums = None
+        if 19 != self.decoder.idNumber:
+            self.blockIndex = self.decoder.decodeBlockIndex(self.bFile)
+            self.blockSpans = self.getBlockSpans()
+            self.checksums = self.decoder.decodeChecksums(self.bFile)
+        else:
+            self.blockIndex, self.blockSpans = self.indexRecords()
+
+        self.rowStarts = []
+        rowStart = 0
+        for entry in self.blockIndex:
+            self.rowStarts.append(rowStart)
+            rowStart += entry[1]
+
+        self.skipDamaged = skipDamaged
+        self.damagedBlocks = set()
+        self.maxBlocks = maxBlocks
+        self.blockCache = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def close(self):
+        '''
+        Close the compressed file.
+
+        Parameters:
+            None
+
+        Attributes:
+            None
+
+        Return:
+            None
+        '''
+        with self.lock:
+            self.bFile.close()
+            self.blockCache.clear()
+
+    def decodeBlock(self, blockData, blockRows):
+        '''
+        Decode a block's records into rows.
+
+        Parameters:
+            blockData (string): block's encoded records
+            blockRows (int): number of records in the block
+
+        Attributes:
+            None
+
+        Return:
+            rows (List:Tuple): (ticker, exchange, side, condition, sendTime, recvTime, price, size)
+        '''
+        rows = []
+        for condFlags, decodeIndex, exchange, side, condition, sendTime, timeDiff, price, size in \
+          self.decoder.decodeBlock(blockData,  blockRows,  self.tickerDecode_MemSize):
+
+            #round float price to its price precision
+            if condFlags & 7:
+                price = round(price, condFlags & 7)
+
+            rows.append((self.tickerDict[decodeIndex], exchange, side, condition,
+                         sendTime, sendTime + timeDiff, price, size))
+
+        return rows
+
+    def get(self, rowIndex):
+        '''
+        Get a row by its index.
+
+        Parameters:
+            rowIndex (int): row index in the compressed file
+
+        Attributes:
+            blockNumber (int): block holding the row
+
+        Return:
+            row (Tuple): (ticker, exchange, side, condition, sendTime, recvTime, price, size)
+        '''
+        if rowIndex < 0 or rowIndex >= self.rowCount:
+            raise IndexError('row index {0} out of range'.format(rowIndex))
+
+        blockNumber = bisect.bisect_right(self.rowStarts, rowIndex) - 1
+
+        return self.getBlock(blockNumber)[rowIndex - self.rowStarts[blockNumber]]
+
+    def getBlock(self, blockNumber):
+        '''
+        Get a block's decoded rows from the cache, decoding the block on a miss.
+        Raises CompressorError if the block does not match its checksum or cannot be decoded.
+        NOTE: the file is only locked while reading, blocks are decoded unlocked.
+
+        Parameters:
+            blockNumber (int): block's position in the block index
+
+        Attributes:
+            rows (List:Tuple): block's decoded rows
+
+        Return:
+            rows (List:Tuple): block's decoded rows
+        '''
+        with self.lock:
+            rows = self.blockCache.pop(blockNumber, None)
+            if rows is not None:
+                #move block to most recently used
+                self.blockCache[blockNumber] = rows
+                self.hits += 1
+                return rows
+
+            self.misses += 1
+            blockOffset, blockByteSize = self.blockSpans[blockNumber]
+            self.bFile.seek(blockOffset)
+            blockData = self.bFile.read(blockByteSize)
+
+        #damaged blocks are not cached
+        try:
+            if self.checksums is not None and zlib.crc32(blockData) & 0xffffffff != self.checksums[blockNumber]:
+                raise ValueError('checksum mismatch')
+            rows = self.decodeBlock(blockData,  self.blockIndex[blockNumber][1])
+        except (ValueError, IndexError, struct.error) as error:
+            with self.lock:
+                self.damagedBlocks.add(blockNumber)
+            raise compressor.CompressorError('Block {0} is damaged: {1}'.format(blockNumber, error))
+
+        with self.lock:
+            self.blockCache[blockNumber] = rows
+            #evict least recently used blocks
+            while len(self.blockCache) > self.maxBlocks:
+                self.blockCache.popitem(False)
+
+        return rows
+
+    def getBlockSpans(self):
+        '''
+        Get the position and byte size of each block's records from the block index.
+
+        Parameters:
+            None
+
+        Attributes:
+            None
+
+        Return:
+            blockSpans (List:Tuple(int,int)): file position and byte size of each block's records
+        '''
+        #block records follow the block header (row count and byte size)
+        return [(blockOffset + 8, blockByteSize) for blockOffset, blockRows, blockByteSize in
+                self.decoder.decodeBlockSpans(self.bFile)]
+
+    def getRows(self, blockNumber):
+        '''
+        Get a block's decoded rows for scan() and select(), no rows if the block is
+        damaged and damaged blocks are skipped.
+
+        Parameters:
+            blockNumber (int): block's position in the block index
+
+        Attributes:
+            None
+
+        Return:
+            rows (List:Tuple): block's decoded rows
+        '''
+        try:
+            return self.getBlock(blockNumber)
+        except compressor.CompressorError:
+            if not self.skipDamaged:
+                raise
+            return []
+
+    def indexRecords(self):
+        '''
+        Index a compressed file without blocks by scanning its records once,
+        grouping them into blocks of block size records.
+
+        Parameters:
+            None
+
+        Attributes:
+            None
+
+        Return:
+            blockIndex (List:Tuple(int,int,int,int)): block's file position, row count,
+                                                      minimum and maximum sendtime
+            blockSpans (List:Tuple(int,int)): file position and byte size of each block's records
+        '''
+        return self.decoder.indexRecords(self.bFile,  self.tickerDecode_MemSize)
+
+    def scan(self, start=0, stop=None):
+        '''
+        Iterate through the rows with index in [start, stop).
+
+        Parameters:
+            start (int): first row index included
+            stop (int): first row index excluded, end of file if None
+
+        Attributes:
+            blockNumber (int): block being scanned
+
+        Return:
+            row (Tuple) generator, see get()
+        '''
+        if stop is None or stop > self.rowCount:
+            stop = self.rowCount
+        if start >= stop:
+            return
+
+        blockNumber = bisect.bisect_right(self.rowStarts, start) - 1
+        while blockNumber < len(self.blockIndex) and self.rowStarts[blockNumber] < stop:
+            rowStart = self.rowStarts[blockNumber]
+            rows = self.getRows(blockNumber)
+            for row in rows[max(start - rowStart, 0):stop - rowStart]:
+                yield row
+            blockNumber += 1
+
+    def select(self, tickers=None, startTime=None, stopTime=None):
+        '''
+        Iterate through the rows matching the tickers and sendtime in [startTime, stopTime).
+        Blocks outside the time range are skipped using the block index.
+
+        Parameters:
+            tickers (List:string): tickers to be matched, all if None
+            startTime (int): first sendtime included, no lower bound if None
+            stopTime (int): first sendtime excluded, no upper bound if None
+
+        Attributes:
+            tickerSet (Set:string): tickers to be matched
+
+        Return:
+            row (Tuple) generator, see get()
+        '''
+        tickerSet = None
+        if tickers is not None:
+            tickerSet = set(tickers)
+
+        for blockNumber, (blockOffset, blockRows, minSendTime, maxSendTime) in enumerate(self.blockIndex):
+            #skip blocks outside the time range
+            if (startTime is not None and maxSendTime < startTime) or \
+               (stopTime is not None and minSendTime >= stopTime):
+                continue
+
+            for row in self.getRows(blockNumber):
+                if tickerSet is not None and row[0] not in tickerSet:
+                    continue
+                if (startTime is not None and row[4] < startTime) or \
+                   (stopTime is not None and row[4] >= stopTime):
+                    continue
+                yield row
@@ -0,0 +1,90 @@
+'''
+BAT Compressor Test Files
+Author: Derek Bredbenner
+'''
+
+import io
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import compressor
+from TickerStruct import pythonDict
+
+
+def newCompressor():
+    '''
+    Create a compressor writing its messages to memory.
+    NOTE: tickers are collected with PythonDict, TickerList loses tickers on some inputs
+
+    Parameters:
+        None
+
+    Return:
+        compressor (Compressor): compressor for the tests
+    '''
+    job = compressor.Compressor()
+    job.tickerStruct = pythonDict.PythonDict()
+    job.output = io.BytesIO()
+    return job
+
+
+def writeBatFile(iFileName, rowCount=3000, seed=7):
+    '''
+    Write a BAT file with a few busy tickers and many rare ones, prices with
+    0, 2 and 4 digits of precision and every time difference and size width.
+
+    Parameters:
+        iFileName (string): BAT file to be written
+        rowCount (int): number of lines
+        seed (int): random seed, the same seed writes the same file
+
+    Return:
+        lines (List:string): lines written
+    '''
+    rand = random.Random(seed)
+    tickers = ['AAPL', 'MSFT', 'GOOG', 'IBM', 'SPY', 'QQQ', 'T', 'F', 'GE', 'XOM'] + ['S{0:03d}'.format(x) for x in range(300)]
+    sendTime = 34200000
+    lines = []
+    for x in range(rowCount):
+        sendTime += rand.randint(0, 50)
+        ticker = rand.choice(tickers[:12]) if rand.random() < 0.8 else rand.choice(tickers)
+        precision = rand.choice([0, 2, 2, 4])
+        price = rand.uniform(1, 500)
+        lines.append('{0},{1},{2},{3},{4},{5},{6},{7}\r\n'.format(
+          ticker, rand.choice('PQZ'), rand.choice('BS'), rand.choice('@FT'), sendTime,
+          sendTime + rand.choice([0, 3, 300, 70000]),
+          '{0:.{1}f}'.format(price, precision) if precision else int(price),
+          rand.choice([100, 200, 300, 1000, 70000])))
+
+    with open(iFileName, 'wb') as iFile:
+        iFile.write(''.join(lines))
+
+    return lines
+
+
+
+def writeRecordsOnly(iFileName, bFileName):
+    '''
+    Compress a BAT file into a records only file (file identifier 19), which this
+    program only reads.
+
+    Parameters:
+        iFileName (string): BAT file to be compressed
+        bFileName (string): compressed file
+
+    Return:
+        None
+    '''
+    writer = newCompressor()
+    writer.idNumber = 19
+    writer.firstRead(iFileName)
+    writer.tickerStruct.buildTickerDict(writer.tickerDict)
+    tickerEncode_MemSize = writer.getTickerEncode_MemSize()
+
+    with open(iFileName, 'rb') as iFile, open(bFileName, 'wb') as bFile:
+        writer.encodeHeader(bFile)
+        for line in iFile:
+            writer.encodeRecord(bFile,  writer.parseRecord(line.split(',')),  tickerEncode_MemSize)
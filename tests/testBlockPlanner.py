@@ -0,0 +1,73 @@
+'''
+BAT Compressor Block Planner Tests
+Author: Derek Bredbenner
+'''
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import blockPlanner
+
+
+class BlockPlannerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.planner = blockPlanner.BlockPlanner()
+        self.random = random.Random(3)
+
+    def checkColumn(self, values, encoding):
+        '''
+        Encode a column, check the planner picked the encoding and the column decodes
+        and skips to its end from a nonzero offset.
+
+        Parameters:
+            values (List:int): column's values
+            encoding (int): encoding expected to be picked
+
+        Attributes:
+            data (string): encoded column after a two byte prefix
+
+        Return:
+            None
+        '''
+        data = 'xy' + self.planner.encodeColumn(values)
+        self.assertEqual(encoding, ord(data[2]))
+
+        decoded, offset = self.planner.decodeColumn(data, 2, len(values))
+        self.assertEqual(values, list(decoded))
+        self.assertEqual(len(data), offset)
+        self.assertEqual(len(data), self.planner.skipColumn(data, 2, len(values)))
+
+    def testRaw(self):
+        self.checkColumn([self.random.randint(-128, 127) for x in range(100)], self.planner.RAW)
+
+    def testFrameOfReference(self):
+        self.checkColumn([1000000 + self.random.randint(0, 200) for x in range(100)], self.planner.FOR)
+
+    def testDelta(self):
+        self.checkColumn([x * 1000 + self.random.randint(0, 100) for x in range(100)], self.planner.DELTA)
+
+    def testDictionary(self):
+        self.checkColumn([self.random.choice([10**9, 2 * 10**9, 3 * 10**9]) for x in range(100)], self.planner.DICT)
+
+    def testRunLength(self):
+        self.checkColumn([5] * 50 + [7] * 50, self.planner.RLE)
+
+    def testVariableLengthDelta(self):
+        self.checkColumn(range(50) + [10**12 + x for x in range(50)], self.planner.VARDELTA)
+
+    def testEdgeValues(self):
+        #single values, negative values and values needing 8 bytes round trip whatever the encoding
+        for values in ([0], [-1], [2**63 - 1], [-2**63, 2**63 - 1], [-5, -5, -5, 3], [2**40] * 7):
+            data = self.planner.encodeColumn(values)
+            decoded, offset = self.planner.decodeColumn(data, 0, len(values))
+            self.assertEqual(values, list(decoded))
+            self.assertEqual(len(data), offset)
+
+
+if __name__ == '__main__':
+    unittest.main()
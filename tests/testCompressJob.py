@@ -0,0 +1,91 @@
+'''
+BAT Compressor Job Tests
+Author: Derek Bredbenner
+'''
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+import batFiles
+import compressJob
+import compressor
+
+
+class CompressJobTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+        self.iFileName = os.path.join(self.tempDir, 'in.csv')
+        self.lines = batFiles.writeBatFile(self.iFileName)
+        self.bFileName = os.path.join(self.tempDir, 'in.bin')
+        self.oFileName = os.path.join(self.tempDir, 'out.csv')
+
+        encoder = batFiles.newCompressor()
+        encoder.blockSize = 256
+        encoder.compress(self.iFileName, self.bFileName)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def testDecompress(self):
+        progress = []
+        done = threading.Event()
+        job = compressJob.decompressAsync(self.bFileName, self.oFileName,
+                                          progress=lambda rowsDone, rowCount: progress.append(rowsDone),
+                                          done=lambda job: done.set())
+        self.assertTrue(job.wait(30))
+        self.assertTrue(done.is_set())
+        self.assertTrue(job.finished())
+        self.assertFalse(job.cancelled())
+        self.assertEqual(len(self.lines), progress[-1])
+        self.assertIn('decompression complete', job.messages())
+
+        with open(self.oFileName, 'rb') as oFile:
+            self.assertEqual(self.lines, oFile.read().splitlines(True))
+
+    def testCancel(self):
+        def progress(rowsDone, rowCount):
+            if rowsDone >= 512:
+                job.cancel()
+
+        threadCount = threading.active_count()
+        job = compressJob.CompressJob('decompress', self.bFileName, self.oFileName, progress)
+        job.start()
+        with self.assertRaises(compressor.CompressorCancelled):
+            job.wait(30)
+        self.assertTrue(job.cancelled())
+        self.assertNotIn('decompression complete', job.messages())
+
+        #the job's thread and its pipeline threads stop with the job
+        for x in range(100):
+            if threading.active_count() == threadCount:
+                break
+            time.sleep(0.01)
+        self.assertEqual(threadCount, threading.active_count())
+
+    def testError(self):
+        #errors are raised from wait() instead of exiting
+        job = compressJob.decompressAsync(self.iFileName, self.oFileName)
+        with self.assertRaises(compressor.CompressorError):
+            job.wait(30)
+        self.assertFalse(job.cancelled())
+
+    def testMessages(self):
+        #job messages stay off the shared standard output
+        stdout = sys.stdout
+        sys.stdout = output = tempfile.TemporaryFile()
+        try:
+            compressJob.decompressAsync(self.bFileName, self.oFileName).wait(30)
+        finally:
+            sys.stdout = stdout
+        output.seek(0)
+        self.assertEqual('', output.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+'''
+BAT Compressor Round Trip Tests
+Author: Derek Bredbenner
+'''
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import batFiles
+import compressor
+
+
+class RoundTripTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+        self.iFileName = os.path.join(self.tempDir, 'in.csv')
+        self.lines = batFiles.writeBatFile(self.iFileName)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def path(self, fileName):
+        return os.path.join(self.tempDir, fileName)
+
+    def decompressLines(self, bFileName, **settings):
+        '''
+        Decompress a compressed file and read its lines.
+
+        Parameters:
+            bFileName (string): compressed file
+            settings (Dict): compressor attributes set before decompressing
+
+        Attributes:
+            oFileName (string): decompressed BAT file
+
+        Return:
+            lines (List:string): decompressed lines
+        '''
+        decoder = batFiles.newCompressor()
+        for name, value in settings.items():
+            setattr(decoder, name, value)
+
+        oFileName = self.path('out.csv')
+        decoder.decompress(bFileName, oFileName)
+        with open(oFileName, 'rb') as oFile:
+            return oFile.read().splitlines(True)
+
+    def compressFile(self, bFileName, **settings):
+        '''
+        Compress the test BAT file with small blocks so it spans several blocks.
+
+        Parameters:
+            bFileName (string): compressed file
+            settings (Dict): compressor attributes set before compressing
+
+        Attributes:
+            encoder (Compressor): compresses the test BAT file
+
+        Return:
+            None
+        '''
+        encoder = batFiles.newCompressor()
+        encoder.blockSize = 256
+        for name, value in settings.items():
+            setattr(encoder, name, value)
+        encoder.compress(self.iFileName, bFileName)
+
+    def readID(self, bFileName):
+        decoder = batFiles.newCompressor()
+        decoder.messages = False
+        with open(bFileName, 'rb') as bFile:
+            decoder.decodeHeader(bFile)
+        return decoder.idNumber
+
+    def testColumnBlocks(self):
+        self.compressFile(self.path('c22.bin'))
+        self.assertEqual(22, self.readID(self.path('c22.bin')))
+        self.assertEqual(self.lines, self.decompressLines(self.path('c22.bin')))
+
+    def testRowBlocks(self):
+        self.compressFile(self.path('c20.bin'), idNumber=20)
+        self.assertEqual(20, self.readID(self.path('c20.bin')))
+        self.assertEqual(self.lines, self.decompressLines(self.path('c20.bin')))
+
+    def testRepeatFields(self):
+        self.compressFile(self.path('cr.bin'), repeatFields=True)
+        self.assertEqual(self.lines, self.decompressLines(self.path('cr.bin')))
+
+        #repeated records make the repeated fields layout cheaper
+        self.lines = [line for line in self.lines for x in range(4)]
+        with open(self.iFileName, 'wb') as iFile:
+            iFile.write(''.join(self.lines))
+        self.compressFile(self.path('cr.bin'), repeatFields=True)
+        self.assertEqual(self.lines, self.decompressLines(self.path('cr.bin')))
+
+        decoder = batFiles.newCompressor()
+        with open(self.path('cr.bin'), 'rb') as bFile:
+            decoder.decodeHeader(bFile)
+            blockFlags = []
+            for entry in decoder.decodeBlockIndex(bFile):
+                bFile.seek(entry[0] + 8)
+                blockFlags.append(ord(bFile.read(1)))
+        self.assertTrue(all([flags & 2 for flags in blockFlags]))
+
+    def testGroupTickers(self):
+        self.compressFile(self.path('cg.bin'), groupTickers=True)
+        self.assertEqual(self.lines, self.decompressLines(self.path('cg.bin')))
+
+        #grouped output holds each block's records, grouped by ticker
+        grouped = self.decompressLines(self.path('cg.bin'), groupedOutput=True)
+        self.assertNotEqual(self.lines, grouped)
+        for x in range(0, len(self.lines), 256):
+            self.assertEqual(sorted(self.lines[x:x + 256]), sorted(grouped[x:x + 256]))
+            self.assertEqual(sorted(self.lines[x:x + 256], key=lambda line: line.split(',')[0]), grouped[x:x + 256])
+
+        #grouped blocks do not flag repeated fields
+        self.assertRaises(compressor.CompressorError, self.compressFile, self.path('cgr.bin'),
+                          groupTickers=True, repeatFields=True)
+
+    def testSinglePass(self):
+        #row blocks, column blocks, repeated fields and grouped blocks renumber their tickers
+        for idNumber, repeatFields, groupTickers in ((20, False, False), (22, False, False),
+                                                     (22, True, False), (22, False, True)):
+            encoder = batFiles.newCompressor()
+            encoder.idNumber = idNumber
+            encoder.repeatFields = repeatFields
+            encoder.groupTickers = groupTickers
+            encoder.memoryBudget = 1 << 20
+            with open(self.iFileName, 'rb') as iFile:
+                encoder.compressStream(iFile, self.path('cs.bin'))
+            self.assertEqual(4096, encoder.blockSize)
+            self.assertEqual(idNumber, self.readID(self.path('cs.bin')))
+            self.assertEqual(self.lines, self.decompressLines(self.path('cs.bin')))
+
+        #blocks with repeated fields flagged renumber their changed tickers
+        self.lines = [line for line in self.lines for x in range(4)]
+        with open(self.iFileName, 'wb') as iFile:
+            iFile.write(''.join(self.lines))
+        encoder.repeatFields = True
+        encoder.groupTickers = False
+        with open(self.iFileName, 'rb') as iFile:
+            encoder.compressStream(iFile, self.path('cs.bin'))
+        self.assertEqual(self.lines, self.decompressLines(self.path('cs.bin')))
+
+    def testPipelined(self):
+        self.compressFile(self.path('cp.bin'), pipelineDepth=2, chunkSize=4096)
+        self.assertEqual(self.lines, self.decompressLines(self.path('cp.bin'), pipelineDepth=2))
+
+    def testRecordsOnly(self):
+        batFiles.writeRecordsOnly(self.iFileName, self.path('c19.bin'))
+        self.assertEqual(19, self.readID(self.path('c19.bin')))
+        self.assertEqual(self.lines, self.decompressLines(self.path('c19.bin')))
+
+    def testTranscode(self):
+        batFiles.writeRecordsOnly(self.iFileName, self.path('c19.bin'))
+        self.compressFile(self.path('c20.bin'), idNumber=20)
+        for iFileName in ('c19.bin', 'c20.bin'):
+            for idNumber, repeatFields, groupTickers in ((22, False, False), (20, False, False),
+                                                         (22, True, False), (22, False, True)):
+                oFileName = self.path('t{0}{1:d}{2:d}.bin'.format(idNumber, repeatFields, groupTickers))
+                encoder = batFiles.newCompressor()
+                encoder.idNumber = idNumber
+                encoder.blockSize = 512
+                encoder.repeatFields = repeatFields
+                encoder.groupTickers = groupTickers
+                encoder.transcode(self.path(iFileName), oFileName, 2)
+                self.assertEqual(idNumber, self.readID(oFileName))
+                self.assertEqual(self.lines, self.decompressLines(oFileName))
+
+        #output matches compressing the BAT file with the same settings
+        self.compressFile(self.path('c22.bin'), blockSize=512)
+        with open(self.path('c22.bin'), 'rb') as cFile, open(self.path('t2200.bin'), 'rb') as tFile:
+            self.assertEqual(cFile.read(), tFile.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
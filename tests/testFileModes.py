@@ -0,0 +1,212 @@
+'''
+BAT Compressor File Mode Tests
+Author: Derek Bredbenner
+'''
+
+import ast
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+import zipfile
+
+import batFiles
+from compressor import Compressor, CompressorError, MemberFile
+
+
+class FileModeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+        self.iFileName = self.path('in.csv')
+        self.lines = batFiles.writeBatFile(self.iFileName)
+        self.bFileName = self.path('in.bin')
+        self.compressFile(self.iFileName, self.bFileName)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def path(self, fileName):
+        return os.path.join(self.tempDir, fileName)
+
+    def compressFile(self, iFileName, bFileName, idNumber=22):
+        encoder = batFiles.newCompressor()
+        encoder.idNumber = idNumber
+        encoder.blockSize = 256
+        encoder.compress(iFileName, bFileName)
+
+    def decompressLines(self, bFileName):
+        oFileName = self.path('out.csv')
+        batFiles.newCompressor().decompress(bFileName, oFileName)
+        with open(oFileName, 'rb') as oFile:
+            return oFile.read().splitlines(True)
+
+    def readColumn(self, npyData):
+        '''
+        Read a one dimensional .npy column of numbers.
+
+        Parameters:
+            npyData (string): .npy file's data
+
+        Attributes:
+            headerSize (int): byte size of the .npy header's dictionary
+
+        Return:
+            values (Tuple): column's values
+        '''
+        headerSize = struct.unpack_from('<H', npyData, 8)[0]
+        header = ast.literal_eval(npyData[10:10 + headerSize])
+        format = {'<f8':'d', '<i4':'i', '<i8':'q', '<u4':'I', '|u1':'B'}[header['descr']]
+        return struct.unpack_from('<{0}{1}'.format(header['shape'][0], format), npyData, 10 + headerSize)
+
+    def testExport(self):
+        batFiles.newCompressor().export(self.bFileName, self.path('out.npz'))
+
+        #exported values match the BAT file's values, float32 prices included
+        with zipfile.ZipFile(self.path('out.npz')) as zFile:
+            for name, field, parse in (('sendtime', 4, int), ('recvtime', 5, int), ('price', 6, float), ('size', 7, int)):
+                self.assertEqual([parse(line.split(',')[field]) for line in self.lines],
+                                 list(self.readColumn(zFile.read(name + '.npy'))))
+
+        #.npy directories hold the same columns
+        batFiles.newCompressor().export(self.bFileName, self.path('out'))
+        with open(os.path.join(self.path('out'), 'size.npy'), 'rb') as cFile:
+            self.assertEqual([int(line.split(',')[7]) for line in self.lines], list(self.readColumn(cFile.read())))
+
+    def testInfo(self):
+        info = batFiles.newCompressor().getInfo(self.bFileName)
+        sendTimes = [int(line.split(',')[4]) for line in self.lines]
+        self.assertEqual((22, len(self.lines), min(sendTimes), max(sendTimes)),
+                         (info['idNumber'], info['rowCount'], info['minSendTime'], info['maxSendTime']))
+        self.assertEqual(len([line for line in self.lines if line.startswith('AAPL,')]), info['tickerCounts']['AAPL'])
+        self.assertEqual(os.path.getsize(self.bFileName), info['fileBytes'])
+
+        #column encoded blocks store the price precision instead of the condition flags
+        self.assertEqual('precision', info['fieldNames'][8])
+        self.compressFile(self.iFileName, self.path('in20.bin'), 20)
+        self.assertEqual('condition flags', batFiles.newCompressor().getInfo(self.path('in20.bin'))['fieldNames'][8])
+
+        #files without records have no sendtime range
+        batFiles.newCompressor().slice(self.bFileName, self.path('empty.bin'), 0, 1)
+        info = batFiles.newCompressor().getInfo(self.path('empty.bin'))
+        self.assertEqual((0, 0, None, None), (info['rowCount'], info['blockCount'], info['minSendTime'], info['maxSendTime']))
+
+    def testMerge(self):
+        otherFileName = self.path('other.csv')
+        otherLines = batFiles.writeBatFile(otherFileName, 2000, 11)
+        self.compressFile(otherFileName, self.path('other.bin'))
+
+        batFiles.newCompressor().merge([self.bFileName, self.path('other.bin')], self.path('merged.bin'))
+
+        #equal sendtimes keep the inputs' order
+        merged = sorted([(int(line.split(',')[4]), 0, x, line) for x, line in enumerate(self.lines)] +
+                        [(int(line.split(',')[4]), 1, x, line) for x, line in enumerate(otherLines)])
+        self.assertEqual([entry[3] for entry in merged], self.decompressLines(self.path('merged.bin')))
+
+    def testMergeTickerInputs(self):
+        #one input per ticker, in the tickers' first appearance order
+        tickers = []
+        for line in self.lines:
+            if line.split(',')[0] not in tickers:
+                tickers.append(line.split(',')[0])
+        bFileNames = []
+        for x, ticker in enumerate(tickers):
+            with open(self.path('ticker.csv'), 'wb') as tFile:
+                tFile.writelines([line for line in self.lines if line.split(',')[0] == ticker])
+            bFileNames.append(self.path('ticker{0}.bin'.format(x)))
+            self.compressFile(self.path('ticker.csv'), bFileNames[-1])
+
+        #the unified ticker dictionary does not depend on the merger's ticker structure
+        Compressor().merge(bFileNames, self.path('merged.bin'))
+
+        merged = sorted([(int(line.split(',')[4]), tickers.index(line.split(',')[0]), x, line)
+                         for x, line in enumerate(self.lines)])
+        self.assertEqual([entry[3] for entry in merged], self.decompressLines(self.path('merged.bin')))
+
+    def testSlice(self):
+        startTime = int(self.lines[300].split(',')[4])
+        stopTime = int(self.lines[2500].split(',')[4])
+        batFiles.newCompressor().slice(self.bFileName, self.path('slice.bin'), startTime, stopTime)
+
+        self.assertEqual([line for line in self.lines if startTime <= int(line.split(',')[4]) < stopTime],
+                         self.decompressLines(self.path('slice.bin')))
+
+    def testSplitTicker(self):
+        tickers = sorted(set([line.split(',')[0] for line in self.lines]))
+
+        #a small memory budget spills short blocks
+        for memoryBudget in (64 << 20, 600 * 300):
+            outputDir = self.path('split{0}'.format(memoryBudget))
+            splitter = batFiles.newCompressor()
+            splitter.blockSize = 256
+            splitter.memoryBudget = memoryBudget
+            splitter.split(self.bFileName, outputDir, 'ticker')
+
+            self.assertEqual([ticker + '.bin' for ticker in tickers], sorted(os.listdir(outputDir)))
+            for ticker in ('AAPL', 'XOM', tickers[-1]):
+                self.assertEqual([line for line in self.lines if line.split(',')[0] == ticker],
+                                 self.decompressLines(os.path.join(outputDir, ticker + '.bin')))
+
+    def testSplitTickerKeys(self):
+        batFiles.newCompressor().split(self.bFileName, self.path('keys'), 'ticker', ['MSFT', 'NONE'])
+        self.assertEqual(['MSFT.bin'], os.listdir(self.path('keys')))
+
+    def writeArchiveInputs(self):
+        '''
+        Write three BAT files to be archived.
+
+        Parameters:
+            None
+
+        Attributes:
+            inputDir (string): directory of the BAT files
+
+        Return:
+            inputs (Dict): member name to its BAT file's lines
+        '''
+        inputDir = self.path('inputs')
+        os.makedirs(inputDir)
+        inputs = {}
+        for memberName, rowCount, seed in (('a.csv', 3000, 7), ('b.csv', 1000, 11), ('c.csv', 10, 13)):
+            inputs[memberName] = batFiles.writeBatFile(os.path.join(inputDir, memberName), rowCount, seed)
+        return inputs
+
+    def testArchive(self):
+        inputs = self.writeArchiveInputs()
+        archiver = batFiles.newCompressor()
+        archiver.blockSize = 256
+        archiver.archive(self.path('inputs'), self.path('in.bat'), 2)
+
+        #members are compressed with the archiver's block size, messages in name order
+        with open(self.path('in.bat'), 'rb') as aFile:
+            manifest = archiver.decodeManifest(aFile)
+            self.assertEqual(['a.csv', 'b.csv', 'c.csv'], [entry[0] for entry in manifest])
+            self.assertEqual([3000, 1000, 10], [entry[3] for entry in manifest])
+            decoder = batFiles.newCompressor()
+            memberFile = MemberFile(aFile, manifest[0][1], manifest[0][2])
+            decoder.decodeHeader(memberFile)
+            self.assertEqual(12, len(decoder.decodeBlockIndex(memberFile)))
+        self.assertEqual(3, archiver.output.getvalue().count('compression complete'))
+
+        batFiles.newCompressor().extract(self.path('in.bat'), self.path('out'), workers=2)
+        self.assertEqual(sorted(inputs), sorted(os.listdir(self.path('out'))))
+        for memberName in inputs:
+            with open(os.path.join(self.path('out'), memberName), 'rb') as oFile:
+                self.assertEqual(inputs[memberName], oFile.read().splitlines(True))
+
+    def testExtractMembers(self):
+        inputs = self.writeArchiveInputs()
+        batFiles.newCompressor().archive(os.path.join(self.path('inputs'), '*.csv'), self.path('in.bat'), 2)
+
+        batFiles.newCompressor().extract(self.path('in.bat'), self.path('out'), ['b.csv'], 2)
+        self.assertEqual(['b.csv'], os.listdir(self.path('out')))
+        with open(os.path.join(self.path('out'), 'b.csv'), 'rb') as oFile:
+            self.assertEqual(inputs['b.csv'], oFile.read().splitlines(True))
+
+        self.assertRaises(CompressorError, batFiles.newCompressor().extract,
+                          self.path('in.bat'), self.path('none'), ['d.csv'])
+
+
+if __name__ == '__main__':
+    unittest.main()
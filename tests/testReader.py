@@ -0,0 +1,127 @@
+'''
+BAT Compressor Reader Tests
+Author: Derek Bredbenner
+'''
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import batFiles
+import reader
+
+
+class ReaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+        self.iFileName = self.path('in.csv')
+        self.lines = batFiles.writeBatFile(self.iFileName)
+        self.bFileName = self.path('in.bin')
+        encoder = batFiles.newCompressor()
+        encoder.blockSize = 256
+        encoder.compress(self.iFileName, self.bFileName)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def path(self, fileName):
+        return os.path.join(self.tempDir, fileName)
+
+    def parseLine(self, line):
+        '''
+        Parse a BAT file line into the row returned by the Reader.
+
+        Parameters:
+            line (string): BAT file line
+
+        Attributes:
+            fields (List:string): line's fields
+
+        Return:
+            row (Tuple): (ticker, exchange, side, condition, sendTime, recvTime, price, size)
+        '''
+        fields = line.rstrip('\r\n').split(',')
+        return tuple(fields[:4]) + (int(fields[4]), int(fields[5]), float(fields[6]), int(fields[7]))
+
+    def testGet(self):
+        batFiles.writeRecordsOnly(self.iFileName, self.path('c19.bin'))
+
+        #records in blocks and records only files
+        for bFileName in (self.bFileName, self.path('c19.bin')):
+            with reader.Reader(bFileName) as bReader:
+                self.assertEqual(len(self.lines), bReader.rowCount)
+                for rowIndex in (0, 255, 256, 1000, len(self.lines) - 1):
+                    self.assertEqual(self.parseLine(self.lines[rowIndex]), bReader.get(rowIndex))
+                self.assertRaises(IndexError, bReader.get, len(self.lines))
+
+    def testScan(self):
+        with reader.Reader(self.bFileName) as bReader:
+            self.assertEqual([self.parseLine(line) for line in self.lines], list(bReader.scan()))
+
+            #ranges crossing block boundaries
+            for start, stop in ((0, 1), (200, 700), (256, 512), (2900, 5000), (10, 10)):
+                self.assertEqual([self.parseLine(line) for line in self.lines[start:stop]],
+                                 list(bReader.scan(start, stop)))
+
+    def testSelect(self):
+        startTime = int(self.lines[300].split(',')[4])
+        stopTime = int(self.lines[2500].split(',')[4])
+        rows = [self.parseLine(line) for line in self.lines]
+
+        with reader.Reader(self.bFileName) as bReader:
+            self.assertEqual(rows, list(bReader.select()))
+            self.assertEqual([row for row in rows if row[0] in ('AAPL', 'XOM')],
+                             list(bReader.select(['AAPL', 'XOM'])))
+
+        #blocks outside the time range are not decoded
+        with reader.Reader(self.bFileName) as bReader:
+            self.assertEqual([row for row in rows if 'MSFT' == row[0] and startTime <= row[4] < stopTime],
+                             list(bReader.select(['MSFT'], startTime, stopTime)))
+            self.assertEqual(len([entry for entry in bReader.blockIndex
+                                  if entry[3] >= startTime and entry[2] < stopTime]), bReader.misses)
+
+    def testBlockCache(self):
+        with reader.Reader(self.bFileName, maxBlocks=2) as bReader:
+            bReader.get(0)
+            bReader.get(1)
+            self.assertEqual((1, 1), (bReader.hits, bReader.misses))
+
+            #block 0 is the most recently used, block 1 is evicted
+            bReader.get(256)
+            bReader.get(0)
+            self.assertEqual((2, 2), (bReader.hits, bReader.misses))
+            self.assertEqual([1, 0], list(bReader.blockCache))
+            bReader.get(512)
+            self.assertEqual([0, 2], list(bReader.blockCache))
+            bReader.get(256)
+            self.assertEqual((2, 4), (bReader.hits, bReader.misses))
+
+    def testThreads(self):
+        rows = [self.parseLine(line) for line in self.lines]
+        errors = []
+
+        with reader.Reader(self.bFileName, maxBlocks=3) as bReader:
+            def readRows(offset):
+                try:
+                    for rowIndex in range(offset, len(rows), 7):
+                        if rows[rowIndex] != bReader.get(rowIndex):
+                            errors.append(rowIndex)
+                except Exception as error:
+                    errors.append(error)
+
+            threads = [threading.Thread(target=readRows, args=(offset,)) for offset in range(7)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual([], errors)
+            self.assertEqual(len(rows), bReader.hits + bReader.misses)
+            self.assertTrue(len(bReader.blockCache) <= 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
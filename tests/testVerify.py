@@ -0,0 +1,125 @@
+'''
+BAT Compressor Damaged Block Tests
+Author: Derek Bredbenner
+'''
+
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import batFiles
+import compressor
+import reader
+
+
+class DamagedBlockTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+        self.iFileName = os.path.join(self.tempDir, 'in.csv')
+        self.lines = batFiles.writeBatFile(self.iFileName)
+
+        #compress, then keep a clean copy and flip a byte inside block 1's records
+        self.bFileName = os.path.join(self.tempDir, 'bad.bin')
+        self.cleanFileName = os.path.join(self.tempDir, 'clean.bin')
+        encoder = batFiles.newCompressor()
+        encoder.blockSize = 256
+        encoder.compress(self.iFileName, self.cleanFileName)
+        shutil.copy(self.cleanFileName, self.bFileName)
+
+        decoder = batFiles.newCompressor()
+        with open(self.bFileName, 'r+b') as bFile:
+            decoder.decodeHeader(bFile)
+            blockIndex = decoder.decodeBlockIndex(bFile)
+            bFile.seek(blockIndex[1][0] + 20)
+            value = bFile.read(1)
+            bFile.seek(-1, 1)
+            bFile.write(chr(ord(value) ^ 0xff))
+
+        #block 1's records are missing when damaged blocks are skipped
+        self.blockRows = blockIndex[0][1], blockIndex[1][1]
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def testVerify(self):
+        checker = batFiles.newCompressor()
+        damaged = checker.verify([self.bFileName, self.cleanFileName], 2)
+        self.assertEqual({self.bFileName:[1], self.cleanFileName:[]}, damaged)
+
+    def testVerifyStatus(self):
+        self.assertEqual(1, batFiles.newCompressor().run(['-v', self.bFileName]))
+        self.assertEqual(0, batFiles.newCompressor().run(['-v', self.cleanFileName]))
+        self.assertEqual(1, batFiles.newCompressor().run(['-v', self.cleanFileName,
+                                                          os.path.join(self.tempDir, 'missing.bin')]))
+
+    def testDecompressRaises(self):
+        for pipelineDepth in (0, 2):
+            decoder = batFiles.newCompressor()
+            decoder.pipelineDepth = pipelineDepth
+            with self.assertRaisesRegexp(compressor.CompressorError, 'Block 1 is damaged'):
+                decoder.decompress(self.bFileName, os.path.join(self.tempDir, 'out.csv'))
+
+    def testDecompressSkips(self):
+        decoder = batFiles.newCompressor()
+        decoder.skipDamaged = True
+        oFileName = os.path.join(self.tempDir, 'out.csv')
+        decoder.decompress(self.bFileName, oFileName)
+
+        with open(oFileName, 'rb') as oFile:
+            lines = oFile.read().splitlines(True)
+        start, stop = self.blockRows[0], sum(self.blockRows)
+        self.assertEqual(self.lines[:start] + self.lines[stop:], lines)
+        self.assertIn('skipping damaged block 1', decoder.output.getvalue())
+
+    def testDamagedBlockHeader(self):
+        #block 1's byte size as stored with the block, not covered by its checksum
+        shutil.copy(self.cleanFileName, self.bFileName)
+        decoder = batFiles.newCompressor()
+        with open(self.bFileName, 'r+b') as bFile:
+            decoder.decodeHeader(bFile)
+            blockIndex = decoder.decodeBlockIndex(bFile)
+            bFile.seek(blockIndex[1][0] + 4)
+            bFile.write(struct.pack('I', 0x7fffffff))
+
+        oFileName = os.path.join(self.tempDir, 'out.csv')
+        with self.assertRaisesRegexp(compressor.CompressorError, 'Block 1 is damaged'):
+            batFiles.newCompressor().decompress(self.bFileName, oFileName)
+
+        #only block 1 is skipped, the following blocks are found through the block index
+        decoder = batFiles.newCompressor()
+        decoder.skipDamaged = True
+        decoder.decompress(self.bFileName, oFileName)
+        with open(oFileName, 'rb') as oFile:
+            lines = oFile.read().splitlines(True)
+        start, stop = self.blockRows[0], sum(self.blockRows)
+        self.assertEqual(self.lines[:start] + self.lines[stop:], lines)
+        self.assertEqual(1, decoder.output.getvalue().count('skipping damaged block'))
+
+        self.assertEqual({self.bFileName:[1]}, batFiles.newCompressor().verify([self.bFileName], 2))
+
+    def testSliceRaises(self):
+        #copied blocks must not be rewritten with a fresh checksum
+        with self.assertRaisesRegexp(compressor.CompressorError, 'Block 1 is damaged'):
+            batFiles.newCompressor().slice(self.bFileName, os.path.join(self.tempDir, 'slice.bin'), 0, 2**31 - 1)
+
+    def testTranscodeRaises(self):
+        with self.assertRaisesRegexp(compressor.CompressorError, 'Block 1 is damaged'):
+            batFiles.newCompressor().transcode(self.bFileName, os.path.join(self.tempDir, 't.bin'), 2)
+
+    def testReader(self):
+        with reader.Reader(self.bFileName) as bReader:
+            self.assertEqual(self.lines[0].split(',')[0], bReader.get(0)[0])
+            with self.assertRaisesRegexp(compressor.CompressorError, 'Block 1 is damaged'):
+                bReader.get(self.blockRows[0])
+            self.assertEqual(set([1]), bReader.damagedBlocks)
+
+        with reader.Reader(self.bFileName, skipDamaged=True) as bReader:
+            self.assertEqual(len(self.lines) - self.blockRows[1], len(list(bReader.scan())))
+            self.assertEqual(set([1]), bReader.damagedBlocks)
+
+
+if __name__ == '__main__':
+    unittest.main()